@@ -2,7 +2,13 @@ import asyncio
 import json
 import logging
 import os
-from typing import Dict
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Optional, Set, Union
+
+try:
+    import orjson as _json
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    import json as _json
 
 from dotenv import load_dotenv
 from telegram.ext import (
@@ -14,7 +20,13 @@ from telegram.ext import (
     filters,
 )
 
-from models import FloorType, FurnitureType, PropertyState, SearchConfig
+from models import (
+    FLOOR_TYPE_BY_VALUE,
+    FloorType,
+    FurnitureType,
+    PropertyState,
+    SearchConfig,
+)
 
 # Configuration file locking for multi-user safety
 config_lock = asyncio.Lock()
@@ -66,6 +78,26 @@ logger = logging.getLogger(__name__)
 user_configs: Dict[int, SearchConfig] = {}
 monitoring_tasks: Dict[int, asyncio.Task] = {}  # user_id -> monitoring task
 
+# Parsed config files: path -> (raw file contents, parsed JSON)
+_config_cache: Dict[str, tuple] = {}
+
+# Saved entry each loaded config was built from: user_id -> (entry hash, config)
+_loaded_entries: Dict[int, tuple] = {}
+
+# Seconds to wait before writing config changes, so rapid edits share one write
+CONFIG_SAVE_DELAY = 2.0
+
+
+@dataclass
+class _SaveState:
+    """Scheduled config save timer and the save tasks it has started"""
+
+    pending: Optional[asyncio.TimerHandle] = None
+    tasks: Set[asyncio.Task] = field(default_factory=set)
+
+
+_save_state = _SaveState()
+
 
 def get_main_menu_keyboard(user_id: int) -> list:
     """Get the main menu keyboard with dynamic monitoring button"""
@@ -112,108 +144,137 @@ def get_main_menu_keyboard(user_id: int) -> list:
     return base_keyboard
 
 
-def load_configs():
-    """Load saved configurations from file"""
+def _read_config_file(config_file: str) -> dict:
+    """Parse a config file, reusing the previous parse while its bytes are unchanged"""
+    with open(config_file, "rb") as f:
+        raw = f.read()
+
+    # Compare contents rather than stat data, which can miss a same-size
+    # rewrite that lands within one mtime tick
+    cached = _config_cache.get(config_file)
+    if cached is not None and cached[0] == raw:
+        return cached[1]
+
+    configs = _json.loads(raw)
+    _config_cache[config_file] = (raw, configs)
+    return configs
+
+
+def load_configs(path: Optional[Union[str, os.PathLike]] = None):
+    """Load saved configurations from file (default location unless path is given)"""
     try:
-        # Use data directory if it exists, otherwise current directory
-        config_file = (
-            "data/user_configs.json" if os.path.exists("data") else "user_configs.json"
-        )
-        with open(config_file) as f:
-            configs = json.load(f)
-            for user_id, config in configs.items():
-                # Handle backwards compatibility for property_state -> property_states
-                if "property_state" in config and "property_states" not in config:
-                    config["property_states"] = [
-                        PropertyState(config["property_state"])
-                    ]
-                    config.pop("property_state", None)  # Remove old field
-                elif "property_states" in config:
-                    config["property_states"] = [
-                        PropertyState(state) for state in config["property_states"]
-                    ]
-
-                # Handle floor_types conversion if needed (with backward compatibility)
-                if "floor_types" in config:
-                    converted_floor_types = []
-                    for floor_type in config["floor_types"]:
-                        # Handle backward compatibility for old floor values
-                        if floor_type == "com-ultimo-andar":
-                            converted_floor_types.append(FloorType.LAST_FLOOR)
-                        elif floor_type == "ultimo-andar":
-                            converted_floor_types.append(FloorType.LAST_FLOOR)
-                        elif floor_type == "andares-intermedios":
-                            converted_floor_types.append(FloorType.MIDDLE_FLOORS)
-                        elif floor_type == "res-do-chao":
-                            converted_floor_types.append(FloorType.GROUND_FLOOR)
-                        else:
-                            try:
-                                converted_floor_types.append(FloorType(floor_type))
-                            except ValueError:
-                                logger.warning(f"Unknown floor type '{floor_type}', skipping")
-                    config["floor_types"] = converted_floor_types
-
-                # Handle backwards compatibility for furniture setting
-                if "has_furniture" in config and "furniture_type" not in config:
-                    config["furniture_type"] = (
-                        FurnitureType.FURNISHED
-                        if config["has_furniture"]
-                        else FurnitureType.INDIFFERENT
+        if path is not None:
+            config_file = os.fspath(path)
+        elif os.path.exists("data"):
+            # Use data directory if it exists, otherwise current directory
+            config_file = "data/user_configs.json"
+        else:
+            config_file = "user_configs.json"
+        configs = _read_config_file(config_file)
+        for user_id, config in configs.items():
+            # Skip users whose saved entry is unchanged since it was last loaded
+            uid = int(user_id)
+            entry_hash = hash(json.dumps(config, sort_keys=True))
+            loaded = _loaded_entries.get(uid)
+            if (
+                loaded is not None
+                and loaded[0] == entry_hash
+                and user_configs.get(uid) is loaded[1]
+            ):
+                continue
+
+            # Work on a copy so the cached parse is left untouched
+            config = dict(config)
+            # Handle backwards compatibility for property_state -> property_states
+            if "property_state" in config and "property_states" not in config:
+                config["property_states"] = [
+                    PropertyState(config["property_state"])
+                ]
+                config.pop("property_state", None)  # Remove old field
+            elif "property_states" in config:
+                config["property_states"] = [
+                    PropertyState(state) for state in config["property_states"]
+                ]
+
+            # Handle floor_types conversion if needed (with backward compatibility)
+            if "floor_types" in config:
+                converted_floor_types = []
+                for floor_type in config["floor_types"]:
+                    # Non-string values (e.g. a list in a corrupt file) are unhashable
+                    converted = (
+                        FLOOR_TYPE_BY_VALUE.get(floor_type)
+                        if isinstance(floor_type, str)
+                        else None
                     )
-                    config.pop("has_furniture", None)  # Remove old field
-                elif "furniture_types" in config and "furniture_type" not in config:
-                    # Convert from old list format to single value (take first item)
-                    if config["furniture_types"]:
-                        old_value = config["furniture_types"][0]
-                        # Map old enum values to new ones
-                        if old_value == "mobilado":
-                            config["furniture_type"] = FurnitureType.FURNISHED
-                        elif old_value == "mobilado-cozinha":
-                            config["furniture_type"] = FurnitureType.KITCHEN_FURNITURE
-                        elif old_value == "sem-mobilia":
-                            config["furniture_type"] = (
-                                FurnitureType.INDIFFERENT
-                            )  # Unfurnished becomes "indifferent"
-                        else:
-                            config["furniture_type"] = FurnitureType.INDIFFERENT
+                    if converted is None:
+                        logger.warning(f"Unknown floor type '{floor_type}', skipping")
                     else:
-                        config["furniture_type"] = FurnitureType.INDIFFERENT
-                    config.pop("furniture_types", None)  # Remove old field
-                elif "furniture_type" in config:
-                    # Handle old furniture_type values too
-                    old_value = config["furniture_type"]
+                        converted_floor_types.append(converted)
+                config["floor_types"] = converted_floor_types
+
+            # Handle backwards compatibility for furniture setting
+            if "has_furniture" in config and "furniture_type" not in config:
+                config["furniture_type"] = (
+                    FurnitureType.FURNISHED
+                    if config["has_furniture"]
+                    else FurnitureType.INDIFFERENT
+                )
+                config.pop("has_furniture", None)  # Remove old field
+            elif "furniture_types" in config and "furniture_type" not in config:
+                # Convert from old list format to single value (take first item)
+                if config["furniture_types"]:
+                    old_value = config["furniture_types"][0]
+                    # Map old enum values to new ones
                     if old_value == "mobilado":
                         config["furniture_type"] = FurnitureType.FURNISHED
                     elif old_value == "mobilado-cozinha":
                         config["furniture_type"] = FurnitureType.KITCHEN_FURNITURE
                     elif old_value == "sem-mobilia":
-                        config["furniture_type"] = FurnitureType.INDIFFERENT
+                        config["furniture_type"] = (
+                            FurnitureType.INDIFFERENT
+                        )  # Unfurnished becomes "indifferent"
                     else:
-                        try:
-                            config["furniture_type"] = FurnitureType(
-                                config["furniture_type"]
-                            )
-                        except ValueError:
-                            config["furniture_type"] = FurnitureType.INDIFFERENT
-
-                # Remove any unknown fields that might cause errors
-                valid_fields = {
-                    "min_rooms",
-                    "max_rooms",
-                    "min_size",
-                    "max_size",
-                    "max_price",
-                    "furniture_type",
-                    "property_states",
-                    "floor_types",
-                    "city",
-                    "custom_polygon",
-                    "update_frequency",
-                }
-                config = {k: v for k, v in config.items() if k in valid_fields}
-
-                user_configs[int(user_id)] = SearchConfig(**config)
-                logger.info(f"Loaded config for user {user_id}: {config}")
+                        config["furniture_type"] = FurnitureType.INDIFFERENT
+                else:
+                    config["furniture_type"] = FurnitureType.INDIFFERENT
+                config.pop("furniture_types", None)  # Remove old field
+            elif "furniture_type" in config:
+                # Handle old furniture_type values too
+                old_value = config["furniture_type"]
+                if old_value == "mobilado":
+                    config["furniture_type"] = FurnitureType.FURNISHED
+                elif old_value == "mobilado-cozinha":
+                    config["furniture_type"] = FurnitureType.KITCHEN_FURNITURE
+                elif old_value == "sem-mobilia":
+                    config["furniture_type"] = FurnitureType.INDIFFERENT
+                else:
+                    try:
+                        config["furniture_type"] = FurnitureType(
+                            config["furniture_type"]
+                        )
+                    except ValueError:
+                        config["furniture_type"] = FurnitureType.INDIFFERENT
+
+            # Remove any unknown fields that might cause errors
+            valid_fields = {
+                "min_rooms",
+                "max_rooms",
+                "min_size",
+                "max_size",
+                "max_price",
+                "furniture_type",
+                "property_states",
+                "floor_types",
+                "city",
+                "custom_polygon",
+                "update_frequency",
+            }
+            config = {k: v for k, v in config.items() if k in valid_fields}
+
+            search_config = SearchConfig(**config)
+            user_configs[uid] = search_config
+            _loaded_entries[uid] = (entry_hash, search_config)
+            logger.info(f"Loaded config for user {uid}: {config}")
     except FileNotFoundError:
         # Create empty config file if it doesn't exist
         logger.info("user_configs.json not found, will create on first save")
@@ -230,7 +291,7 @@ async def save_configs():
         try:
             configs = {}
             for user_id, config in user_configs.items():
-                config_dict = config.__dict__.copy()
+                config_dict = asdict(config)
                 # Convert PropertyState list to string values
                 config_dict["property_states"] = [
                     state.value for state in config_dict["property_states"]
@@ -249,13 +310,53 @@ async def save_configs():
                 if os.path.exists("data")
                 else "user_configs.json"
             )
-            with open(config_file, "w") as f:
-                json.dump(configs, f, indent=2)
+            # Write to a temporary file and swap it in so readers never see
+            # a partially written config
+            tmp_file = f"{config_file}.tmp"
+            try:
+                with open(tmp_file, "w") as f:
+                    json.dump(configs, f, indent=2)
+                os.replace(tmp_file, config_file)
+            except Exception:
+                # Don't leave a half-written temporary file behind
+                try:
+                    os.remove(tmp_file)
+                except OSError:
+                    pass
+                raise
+            # The file was just rewritten, so never serve the old parse for it
+            _config_cache.pop(config_file, None)
             logger.info(f"Saved configurations for {len(configs)} users")
         except Exception as e:
             logger.error(f"Error saving configurations: {e}")
 
 
+def schedule_save() -> None:
+    """Save configurations after CONFIG_SAVE_DELAY, batching changes made meanwhile"""
+    if _save_state.pending is None:
+        _save_state.pending = asyncio.get_running_loop().call_later(
+            CONFIG_SAVE_DELAY, _run_scheduled_save
+        )
+
+
+def _run_scheduled_save() -> None:
+    """Start the scheduled save, keeping a reference until it finishes"""
+    _save_state.pending = None
+    task = asyncio.ensure_future(save_configs())
+    _save_state.tasks.add(task)
+    task.add_done_callback(_save_state.tasks.discard)
+
+
+async def flush_configs(*_args) -> None:
+    """Write any scheduled configuration changes now (also used on shutdown)"""
+    if _save_state.pending is not None:
+        _save_state.pending.cancel()
+        _save_state.pending = None
+        await save_configs()
+    if _save_state.tasks:
+        await asyncio.gather(*_save_state.tasks)
+
+
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Start the conversation and show main menu"""
     logger.info(f"START: Command received from user {update.effective_user.id}")
@@ -392,7 +493,7 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         config = user_configs[user_id]
         config.min_rooms = int(min_rooms)
         config.max_rooms = 10  # Set a high maximum to include all rooms above minimum
-        await save_configs()
+        schedule_save()
         await query.message.edit_text(f"Minimum rooms set to {min_rooms}+!")
 
         # Show main menu
@@ -413,7 +514,7 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         config = user_configs[user_id]
         config.min_size = int(min_size)
         config.max_size = 200  # Set a high maximum to include all sizes above minimum
-        await save_configs()
+        schedule_save()
         await query.message.edit_text(f"Minimum size set to {min_size}m²+!")
 
         # Show main menu
@@ -433,7 +534,7 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             user_configs[user_id] = SearchConfig()
         config = user_configs[user_id]
         config.max_price = int(max_price)
-        await save_configs()
+        schedule_save()
         await query.message.edit_text("Maximum price updated!")
 
         # Show main menu
@@ -469,7 +570,7 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         # Set the single furniture type
         config.furniture_type = target_furniture
 
-        await save_configs()
+        schedule_save()
 
         # Debug: Log the current furniture selection
         logger.info(
@@ -555,7 +656,7 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             # Add if not selected
             config.property_states.append(target_state)
 
-        await save_configs()
+        schedule_save()
 
         # Debug: Log the current state selection
         logger.info(
@@ -625,7 +726,7 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             # Add if not selected
             config.floor_types.append(target_floor)
 
-        await save_configs()
+        schedule_save()
 
         # Debug: Log the current floor selection
         logger.info(
@@ -673,7 +774,7 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             user_configs[user_id] = SearchConfig()
         config = user_configs[user_id]
         config.city = city
-        await save_configs()
+        schedule_save()
         await query.message.edit_text("City updated!")
 
         # Show main menu
@@ -693,7 +794,7 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             user_configs[user_id] = SearchConfig()
         config = user_configs[user_id]
         config.update_frequency = int(minutes)
-        await save_configs()
+        schedule_save()
         await query.message.edit_text("Update frequency updated!")
 
         # Show main menu
@@ -713,7 +814,7 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             user_configs[user_id] = SearchConfig()
         config = user_configs[user_id]
         config.max_pages = int(max_pages)
-        await save_configs()
+        schedule_save()
 
         # Show confirmation with appropriate warning
         if int(max_pages) >= 4:
@@ -741,7 +842,7 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             user_configs[user_id] = SearchConfig()
         config = user_configs[user_id]
         config.custom_polygon = None
-        await save_configs()
+        schedule_save()
         await query.message.edit_text("Custom area cleared!")
 
         # Show main menu
@@ -784,7 +885,7 @@ async def handle_price_input(update: Update, context: ContextTypes.DEFAULT_TYPE)
             user_configs[user_id] = SearchConfig()
         config = user_configs[user_id]
         config.max_price = price
-        await save_configs()
+        schedule_save()
         logger.info(
             f"Successfully updated price to {price}€ for user {update.effective_user.id}"
         )
@@ -846,7 +947,7 @@ async def handle_polygon_input(
 
         config = user_configs[user_id]
         config.custom_polygon = shape_value
-        await save_configs()
+        schedule_save()
         logger.info(
             f"Successfully updated custom polygon for user {update.effective_user.id}"
         )
@@ -942,6 +1043,9 @@ async def start_monitoring(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     query = update.callback_query
     await query.answer()
 
+    # Write pending edits now rather than trusting the save timer to fire
+    await flush_configs()
+
     user_id = update.effective_user.id
     chat_id = update.effective_chat.id
 
@@ -1040,6 +1144,9 @@ async def stop_monitoring(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     query = update.callback_query
     await query.answer()
 
+    # Write pending edits now rather than trusting the save timer to fire
+    await flush_configs()
+
     user_id = update.effective_user.id
 
     # Check if monitoring exists
@@ -1076,7 +1183,7 @@ async def reset_settings(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
     # Reset to default configuration
     user_configs[user_id] = SearchConfig()
-    await save_configs()
+    schedule_save()
 
     logger.info(f"Settings reset to defaults for user {user_id}")
 
@@ -1287,7 +1394,9 @@ def main():
     logger.info("Starting bot with token...")
 
     # Create the Application
-    application = Application.builder().token(token).build()
+    application = (
+        Application.builder().token(token).post_shutdown(flush_configs).build()
+    )
 
     # Add conversation handler with explicit configuration
     conv_handler = ConversationHandler(
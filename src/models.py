@@ -1,6 +1,8 @@
+import urllib.parse
 from dataclasses import dataclass
 from enum import Enum
-from typing import List, Optional
+from functools import lru_cache
+from typing import FrozenSet, List, Optional
 
 
 class PropertyState(Enum):
@@ -9,18 +11,23 @@ class PropertyState(Enum):
     NEW = "com-novo"
 
 
-class FurnitureType(Enum):
+class FurnitureType(str, Enum):
     INDIFFERENT = "indifferent"  # No URL parameter - show all apartments
     FURNISHED = "equipamento_mobilado"  # Fully furnished
     KITCHEN_FURNITURE = "equipamento_so-cozinha-equipada"  # Kitchen only
 
 
-class FloorType(Enum):
+class FloorType(str, Enum):
     LAST_FLOOR = "ultimo-andar"  # Last floor
     MIDDLE_FLOORS = "andares-intermedios"  # Middle floors
     GROUND_FLOOR = "res-do-chao"  # Ground floor
 
 
+# Saved floor value -> FloorType, including values written by older versions
+FLOOR_TYPE_BY_VALUE = {floor_type.value: floor_type for floor_type in FloorType}
+FLOOR_TYPE_BY_VALUE["com-ultimo-andar"] = FloorType.LAST_FLOOR
+
+
 class SizeRange(Enum):
     """Size ranges in square meters (minimum size)"""
 
@@ -43,7 +50,96 @@ class SizeRange(Enum):
         self.max_size = 200  # Set a high maximum to include all sizes above minimum
 
 
-@dataclass
+# Idealista search URL templates
+_CITY_URL_TEMPLATE = "https://www.idealista.pt/arrendar-casas/{city}/com-{params}/"
+_POLYGON_URL_TEMPLATE = (
+    "https://www.idealista.pt/areas/arrendar-casas/com-{params}/?shape={shape}"
+)
+
+# Idealista URL values for property states
+_PROPERTY_STATE_URL_VALUES = {
+    PropertyState.GOOD: "bom-estado",
+    PropertyState.NEEDS_REMODELING: "para-reformar",
+    PropertyState.NEW: "novo",
+}
+
+
+@lru_cache(maxsize=256)
+def _build_url_params(
+    max_price: int,
+    min_size: int,
+    min_rooms: int,
+    max_rooms: int,
+    furniture_type: FurnitureType,
+    property_states: FrozenSet[PropertyState],
+    floor_types: FrozenSet[FloorType],
+) -> str:
+    """Build Idealista URL parameters, memoized on the filter values"""
+    params = []
+
+    # 1. Price filter (always include, default 2000)
+    price = max_price if max_price else 2000
+    params.append(f"preco-max_{price}")
+
+    # 2. Size filter (always include, default 20)
+    min_size = min_size if min_size else 20
+    params.append(f"tamanho-min_{min_size}")
+
+    # 3. Room filters (default t0,t1,t2,t3,t4,t5 if not specified)
+    if min_rooms == 0:
+        room_types = [f"t{i}" for i in range(0, min(max_rooms + 1, 6))]  # t0-t5 max
+    else:
+        room_types = [f"t{i}" for i in range(min_rooms, min(max_rooms + 1, 6))]
+
+    # Add room types following Idealista rules: t1, t2, t3, t4-t5 as separate parameters
+    room_numbers = [int(rt[1:]) for rt in room_types]
+
+    # Always add individual room parameters first (t0, t1, t2, t3)
+    individual_rooms = []
+    for room_num in room_numbers:
+        if room_num <= 3:
+            individual_rooms.append(f"t{room_num}")
+
+    # Add individual room parameters
+    if individual_rooms:
+        params.extend(individual_rooms)
+
+    # Add t4-t5 range as a separate parameter if needed
+    has_t4_or_t5 = any(room_num >= 4 for room_num in room_numbers)
+    if has_t4_or_t5:
+        # Find the range of rooms >= 4
+        high_rooms = [room_num for room_num in room_numbers if room_num >= 4]
+        if high_rooms:
+            min_high = min(high_rooms)
+            max_high = min(max(high_rooms), 5)  # Cap at t5
+            if min_high == max_high:
+                # Single room (e.g., just t4)
+                params.append(f"t{min_high}")
+            else:
+                # Range (e.g., t4-t5)
+                params.append(f"t{min_high}-t{max_high}")
+
+    # 4. Furniture filter (single choice)
+    if furniture_type != FurnitureType.INDIFFERENT:
+        params.append(furniture_type)
+
+    # 5. Property states (only if any are specified), deduplicated in enum order
+    params.extend(
+        _PROPERTY_STATE_URL_VALUES[state]
+        for state in PropertyState
+        if state in property_states
+    )  # Add as separate parameters, not comma-separated
+
+    # 6. Floor types (only if any are specified), deduplicated in enum order
+    params.extend(floor_type for floor_type in FloorType if floor_type in floor_types)
+
+    # 7. Always add long-term rental filter
+    params.append("arrendamento-longa-duracao")
+
+    return ",".join(params)
+
+
+@dataclass(slots=True)
 class SearchConfig:
     # Basic filters
     min_rooms: int = 1  # Minimum number of rooms (will show this number and above)
@@ -85,96 +181,23 @@ class SearchConfig:
 
     def to_url_params(self) -> str:
         """Convert configuration to Idealista URL parameters in the correct order"""
-        params = []
-
-        # 1. Price filter (always include, default 2000)
-        price = self.max_price if self.max_price else 2000
-        params.append(f"preco-max_{price}")
-
-        # 2. Size filter (always include, default 20)
-        min_size = self.min_size if self.min_size else 20
-        params.append(f"tamanho-min_{min_size}")
-
-        # 3. Room filters (default t0,t1,t2,t3,t4,t5 if not specified)
-        if self.min_rooms == 0:
-            room_types = [
-                f"t{i}" for i in range(0, min(self.max_rooms + 1, 6))
-            ]  # t0-t5 max
-        else:
-            room_types = [
-                f"t{i}" for i in range(self.min_rooms, min(self.max_rooms + 1, 6))
-            ]
-
-        # Add room types following Idealista rules: t1, t2, t3, t4-t5 as separate parameters
-        room_numbers = [int(rt[1:]) for rt in room_types]
-
-        # Always add individual room parameters first (t0, t1, t2, t3)
-        individual_rooms = []
-        for room_num in room_numbers:
-            if room_num <= 3:
-                individual_rooms.append(f"t{room_num}")
-
-        # Add individual room parameters
-        if individual_rooms:
-            params.extend(individual_rooms)
-
-        # Add t4-t5 range as a separate parameter if needed
-        has_t4_or_t5 = any(room_num >= 4 for room_num in room_numbers)
-        if has_t4_or_t5:
-            # Find the range of rooms >= 4
-            high_rooms = [room_num for room_num in room_numbers if room_num >= 4]
-            if high_rooms:
-                min_high = min(high_rooms)
-                max_high = min(max(high_rooms), 5)  # Cap at t5
-                if min_high == max_high:
-                    # Single room (e.g., just t4)
-                    params.append(f"t{min_high}")
-                else:
-                    # Range (e.g., t4-t5)
-                    params.append(f"t{min_high}-t{max_high}")
-
-        # 4. Furniture filter (single choice)
-        if self.furniture_type != FurnitureType.INDIFFERENT:
-            params.append(self.furniture_type.value)
-
-        # 5. Property states (only if any are specified)
-        if self.property_states:
-            state_values = []
-            for state in self.property_states:
-                if state == PropertyState.NEW:
-                    state_values.append("novo")
-                elif state == PropertyState.GOOD:
-                    state_values.append("bom-estado")
-                elif state == PropertyState.NEEDS_REMODELING:
-                    state_values.append("para-reformar")
-
-            if state_values:
-                params.extend(
-                    state_values
-                )  # Add as separate parameters, not comma-separated
-
-        # 6. Floor types (only if any are specified)
-        if self.floor_types:
-            floor_values = [floor_type.value for floor_type in self.floor_types]
-            params.extend(floor_values)  # Add as separate parameters
-
-        # 7. Always add long-term rental filter
-        params.append("arrendamento-longa-duracao")
-
-        return ",".join(params)
+        return _build_url_params(
+            self.max_price,
+            self.min_size,
+            self.min_rooms,
+            self.max_rooms,
+            self.furniture_type,
+            frozenset(self.property_states or ()),
+            frozenset(self.floor_types or ()),
+        )
 
     def get_base_url(self) -> str:
         """Get the base URL for Idealista search"""
+        params = self.to_url_params()
         if self.custom_polygon:
-            # For custom polygons, use the path-based filter format with /areas/ endpoint
-            # Format: https://www.idealista.pt/areas/arrendar-casas/com-FILTERS/?shape=POLYGON
-            import urllib.parse
-
-            params = self.to_url_params()
-            # URL-encode the polygon parameter to ensure special characters are properly encoded
-            encoded_polygon = urllib.parse.quote(self.custom_polygon, safe="")
-            return f"https://www.idealista.pt/areas/arrendar-casas/com-{params}/?shape={encoded_polygon}"
-        else:
-            # Build URL in the exact Idealista format for city-based searches
-            params = self.to_url_params()
-            return f"https://www.idealista.pt/arrendar-casas/{self.city}/com-{params}/"
+            # For custom polygons, use the path-based filter format with /areas/
+            # URL-encode the polygon so special characters survive the query string
+            shape = urllib.parse.quote(self.custom_polygon, safe="")
+            return _POLYGON_URL_TEMPLATE.format(params=params, shape=shape)
+        # Build URL in the exact Idealista format for city-based searches
+        return _CITY_URL_TEMPLATE.format(city=self.city, params=params)
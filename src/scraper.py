@@ -4,7 +4,12 @@ import logging
 import os
 import random
 import time
-from typing import Dict, Optional
+from typing import Dict, Optional, TextIO
+
+try:
+    import orjson as _json
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    import json as _json
 
 import aiohttp
 from bs4 import BeautifulSoup
@@ -170,17 +175,30 @@ class IdealistaScraper:
             1000  # Maximum seen listings per user to prevent memory leaks
         )
 
-    async def initialize(self):
-        """Initialize the scraper by loading seen listings"""
+    @staticmethod
+    def _listings_file() -> str:
+        """Path of the seen listings file"""
+        # Use data directory if it exists, otherwise current directory
+        return (
+            "data/seen_listings.json"
+            if os.path.exists("data")
+            else "seen_listings.json"
+        )
+
+    async def initialize(self, seen_file: Optional[TextIO] = None):
+        """Initialize the scraper by loading seen listings
+
+        Args:
+            seen_file: Open file to load seen listings from (default: the listings file)
+        """
         try:
-            # Use data directory if it exists, otherwise current directory
-            listings_file = (
-                "data/seen_listings.json"
-                if os.path.exists("data")
-                else "seen_listings.json"
-            )
-            with open(listings_file) as f:
-                self.seen_listings = {k: set(v) for k, v in json.load(f).items()}
+            # Opened inside the try so a missing file falls through to the reset
+            if seen_file is None:
+                seen_file = open(self._listings_file())
+            with seen_file as f:
+                self.seen_listings = {
+                    k: set(v) for k, v in _json.loads(f.read()).items()
+                }
         except (FileNotFoundError, json.JSONDecodeError):
             self.seen_listings = {}
 
@@ -199,13 +217,7 @@ class IdealistaScraper:
 
     async def save_seen_listings(self):
         """Save seen listings to file"""
-        # Use data directory if it exists, otherwise current directory
-        listings_file = (
-            "data/seen_listings.json"
-            if os.path.exists("data")
-            else "seen_listings.json"
-        )
-        with open(listings_file, "w") as f:
+        with open(self._listings_file(), "w") as f:
             json.dump({k: list(v) for k, v in self.seen_listings.items()}, f)
 
     async def send_telegram_message(
@@ -370,7 +382,7 @@ class IdealistaScraper:
                     )
                     break
 
-                soup = BeautifulSoup(html, "html.parser")
+                soup = BeautifulSoup(html, "lxml")
                 page_listings = []
 
                 # Check if this page has any listings
@@ -736,7 +748,7 @@ class IdealistaScraper:
                     logger.warning(f"TEST MODE: Could not fetch page for test message")
                     return
 
-                soup = BeautifulSoup(page_content, "html.parser")
+                soup = BeautifulSoup(page_content, "lxml")
                 listing_elements = soup.find_all("article", class_="item")
 
                 if not listing_elements:
@@ -1,14 +1,26 @@
+import copy
+
+import aiohttp
 import pytest
+import pytest_asyncio
+from aioresponses import aioresponses
+from pytest_asyncio import is_async_test
 from unittest.mock import MagicMock, AsyncMock
 from telegram import Update, CallbackQuery, Message, User
 from telegram.ext import CallbackContext
 import sys
-import os
 
-sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
 from models import SearchConfig, PropertyState, FurnitureType
 
 
+def pytest_collection_modifyitems(items):
+    """Run every async test on one session-wide event loop"""
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_loop, append=False)
+
+
 @pytest.fixture
 def mock_update():
     """Create a mock update object"""
@@ -80,3 +92,98 @@ def mock_html():
         </div>
     </div>
     """
+
+
+@pytest.fixture
+def serve_page(monkeypatch):
+    """Make scraper.fetch_page return the given HTML for every page"""
+
+    def serve(html):
+        async def fake_fetch_page(session, url, user_id=None):
+            return html
+
+        monkeypatch.setattr("scraper.fetch_page", fake_fetch_page)
+
+    return serve
+
+
+@pytest.fixture
+def chat_id(worker_id, request):
+    """Chat ID unique to this test and xdist worker, so seen listings never mix"""
+    return f"{worker_id}-{request.node.name}"
+
+
+@pytest_asyncio.fixture(scope="session")
+async def aiohttp_session():
+    """Share one real aiohttp session, and its connection pool, across tests"""
+    connector = aiohttp.TCPConnector(limit=64, keepalive_timeout=30)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        yield session
+
+
+@pytest.fixture
+def mock_responses():
+    """Intercept requests made through aiohttp and serve canned responses"""
+    with aioresponses() as mocked:
+        yield mocked
+
+
+@pytest.fixture
+def user_configs(monkeypatch):
+    """Give each test its own bot.user_configs mapping"""
+    import bot
+
+    configs = {}
+    monkeypatch.setattr(bot, "user_configs", configs)
+    return configs
+
+
+@pytest.fixture(scope="session")
+def _default_search_config():
+    """Build the default SearchConfig once per session"""
+    return SearchConfig()
+
+
+@pytest.fixture
+def search_config(_default_search_config, user_configs):
+    """Register a fresh default SearchConfig for user 12345"""
+    # Deep copy so tests never share the list fields of the session instance
+    config = copy.deepcopy(_default_search_config)
+    user_configs[12345] = config
+    return config
+
+
+def _cancel_pending_save(bot):
+    """Cancel a scheduled config save so it cannot fire during another test"""
+    if bot._save_state.pending is not None:
+        bot._save_state.pending.cancel()
+        bot._save_state.pending = None
+
+
+@pytest.fixture(autouse=True)
+def clear_config_cache():
+    """Drop cached config parses and pending saves left over from other tests"""
+    bot = sys.modules.get("bot")
+    if bot is not None:
+        bot._config_cache.clear()
+        _cancel_pending_save(bot)
+    yield
+    bot = sys.modules.get("bot")
+    if bot is not None:
+        _cancel_pending_save(bot)
+
+
+@pytest.fixture(autouse=True)
+def _isolate_bot_state():
+    """Restore bot.user_configs and bot.monitoring_tasks after every test"""
+    bot = sys.modules.get("bot")
+    if bot is None:
+        yield
+        return
+    user_configs, monitoring_tasks = bot.user_configs, bot.monitoring_tasks
+    saved_configs, saved_tasks = user_configs.copy(), monitoring_tasks.copy()
+    yield
+    user_configs.clear()
+    user_configs.update(saved_configs)
+    monitoring_tasks.clear()
+    monitoring_tasks.update(saved_tasks)
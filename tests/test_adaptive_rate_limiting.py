@@ -1,17 +1,13 @@
 import pytest
 import asyncio
 import time
-from unittest.mock import AsyncMock, MagicMock, patch
-import aiohttp
-
-import sys
-import os
-
-sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+from unittest.mock import AsyncMock, patch
 
 from scraper import AdaptiveRateLimiter, global_rate_limiter, fetch_page
 from models import SearchConfig, FurnitureType
 
+TEST_URL = "https://www.idealista.pt/arrendar-casas/lisboa/"
+
 
 class TestAdaptiveRateLimiter:
     """Test adaptive rate limiting functionality"""
@@ -167,48 +163,28 @@ class TestGlobalRateLimiterIntegration:
         assert global_rate_limiter.max_delay == 600  # Updated value
 
     @pytest.mark.asyncio
-    async def test_fetch_page_uses_rate_limiter(self):
+    async def test_fetch_page_uses_rate_limiter(self, aiohttp_session, mock_responses):
         """Test that fetch_page function uses the rate limiter"""
-
-        async def mock_get(url, headers=None):
-            response = MagicMock()
-            response.status = 200
-            response.text = AsyncMock(return_value="<html>Test</html>")
-            return response
-
-        mock_session = MagicMock()
-        mock_session.get.return_value.__aenter__.return_value = await mock_get(
-            "test_url"
-        )
+        mock_responses.get(TEST_URL, status=200, body="<html>Test</html>")
 
         with patch.object(
             global_rate_limiter, "wait_if_needed", new_callable=AsyncMock
         ) as mock_wait:
-            result = await fetch_page(mock_session, "test_url", user_id="test_user")
+            result = await fetch_page(aiohttp_session, TEST_URL, user_id="test_user")
 
             # Should have called rate limiter
             mock_wait.assert_called_once_with("test_user")
             assert result == "<html>Test</html>"
 
     @pytest.mark.asyncio
-    async def test_fetch_page_without_user_id(self):
+    async def test_fetch_page_without_user_id(self, aiohttp_session, mock_responses):
         """Test fetch_page without user_id (should not use per-user rate limiting)"""
-
-        async def mock_get(url, headers=None):
-            response = MagicMock()
-            response.status = 200
-            response.text = AsyncMock(return_value="<html>Test</html>")
-            return response
-
-        mock_session = MagicMock()
-        mock_session.get.return_value.__aenter__.return_value = await mock_get(
-            "test_url"
-        )
+        mock_responses.get(TEST_URL, status=200, body="<html>Test</html>")
 
         with patch.object(
             global_rate_limiter, "wait_if_needed", new_callable=AsyncMock
         ) as mock_wait:
-            result = await fetch_page(mock_session, "test_url")
+            result = await fetch_page(aiohttp_session, TEST_URL)
 
             # Should not have called rate limiter (no user_id provided)
             mock_wait.assert_not_called()
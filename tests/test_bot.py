@@ -1,8 +1,4 @@
 import pytest
-import sys
-import os
-
-sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
 
 from bot import (
     start,
@@ -1,19 +1,17 @@
 import pytest
-import sys
-import os
+from dataclasses import asdict
 from unittest.mock import AsyncMock, MagicMock
 
-sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
-
 from bot import (
     button_handler,
-    user_configs,
     CHOOSING,
     SETTING_FLOOR,
 )
 from filters import set_floor
 from models import SearchConfig, FloorType
 
+_FLOOR_BY_VALUE = {floor_type.value: floor_type for floor_type in FloorType}
+
 
 @pytest.fixture
 def mock_update():
@@ -40,13 +38,10 @@ class TestFloorFilteringBot:
     """Test floor filtering functionality in bot"""
 
     @pytest.mark.asyncio
-    async def test_set_floor_button(self, mock_update, mock_context):
+    async def test_set_floor_button(self, mock_update, mock_context, user_configs):
         """Test the set floor button triggers correct handler"""
         mock_update.callback_query.data = "floor"
 
-        # Clear user configs for clean test
-        user_configs.clear()
-
         result = await set_floor(mock_update, mock_context)
         assert result == SETTING_FLOOR
         mock_update.callback_query.message.edit_text.assert_called_once()
@@ -56,7 +51,9 @@ class TestFloorFilteringBot:
         assert isinstance(user_configs[12345], SearchConfig)
 
     @pytest.mark.asyncio
-    async def test_floor_toggle_last_floor(self, mock_update, mock_context):
+    async def test_floor_toggle_last_floor(
+        self, mock_update, mock_context, user_configs
+    ):
         """Test toggling last floor option"""
         mock_update.callback_query.data = "floor_toggle_last"
 
@@ -72,7 +69,9 @@ class TestFloorFilteringBot:
         mock_update.callback_query.edit_message_text.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_floor_toggle_middle_floors(self, mock_update, mock_context):
+    async def test_floor_toggle_middle_floors(
+        self, mock_update, mock_context, user_configs
+    ):
         """Test toggling middle floors option"""
         mock_update.callback_query.data = "floor_toggle_middle"
 
@@ -87,7 +86,9 @@ class TestFloorFilteringBot:
         assert FloorType.MIDDLE_FLOORS in user_configs[12345].floor_types
 
     @pytest.mark.asyncio
-    async def test_floor_toggle_ground_floor(self, mock_update, mock_context):
+    async def test_floor_toggle_ground_floor(
+        self, mock_update, mock_context, user_configs
+    ):
         """Test toggling ground floor option"""
         mock_update.callback_query.data = "floor_toggle_ground"
 
@@ -102,7 +103,9 @@ class TestFloorFilteringBot:
         assert FloorType.GROUND_FLOOR in user_configs[12345].floor_types
 
     @pytest.mark.asyncio
-    async def test_floor_toggle_remove_selection(self, mock_update, mock_context):
+    async def test_floor_toggle_remove_selection(
+        self, mock_update, mock_context, user_configs
+    ):
         """Test removing a floor selection by toggling it off"""
         mock_update.callback_query.data = "floor_toggle_last"
 
@@ -117,26 +120,32 @@ class TestFloorFilteringBot:
         assert FloorType.LAST_FLOOR not in user_configs[12345].floor_types
 
     @pytest.mark.asyncio
-    async def test_floor_multiple_selections(self, mock_update, mock_context):
+    async def test_floor_multiple_selections(
+        self, mock_update, mock_context, user_configs
+    ):
         """Test selecting multiple floor types"""
-        user_configs[12345] = SearchConfig()
+        config = user_configs[12345] = SearchConfig()
 
         # Select last floor
         mock_update.callback_query.data = "floor_toggle_last"
         await button_handler(mock_update, mock_context)
-        assert FloorType.LAST_FLOOR in user_configs[12345].floor_types
+        floor_types = config.floor_types
+        assert FloorType.LAST_FLOOR in floor_types
 
         # Select ground floor
         mock_update.callback_query.data = "floor_toggle_ground"
         await button_handler(mock_update, mock_context)
-        assert FloorType.GROUND_FLOOR in user_configs[12345].floor_types
-        assert FloorType.LAST_FLOOR in user_configs[12345].floor_types
+        floor_types = config.floor_types
+        assert FloorType.GROUND_FLOOR in floor_types
+        assert FloorType.LAST_FLOOR in floor_types
 
         # Should have both selected
-        assert len(user_configs[12345].floor_types) == 2
+        assert len(floor_types) == 2
 
     @pytest.mark.asyncio
-    async def test_floor_keyboard_shows_selections(self, mock_update, mock_context):
+    async def test_floor_keyboard_shows_selections(
+        self, mock_update, mock_context, user_configs
+    ):
         """Test that keyboard shows current floor selections correctly"""
         # Set up user config with some floors selected
         user_configs[12345] = SearchConfig()
@@ -161,7 +170,7 @@ class TestFloorFilteringBot:
         result = await button_handler(mock_update, mock_context)
         assert result == CHOOSING
 
-    def test_floor_config_in_show_settings(self):
+    def test_floor_config_in_show_settings(self, user_configs):
         """Test that floor configuration appears in settings display"""
         # Set up user config with floor types
         user_configs[12345] = SearchConfig()
@@ -201,7 +210,7 @@ class TestFloorFilteringBot:
         config.floor_types = [FloorType.LAST_FLOOR, FloorType.GROUND_FLOOR]
 
         # Test serialization (what would be saved to JSON)
-        config_dict = config.__dict__.copy()
+        config_dict = asdict(config)
         config_dict["floor_types"] = [
             floor_type.value for floor_type in config_dict["floor_types"]
         ]
@@ -210,7 +219,7 @@ class TestFloorFilteringBot:
         assert config_dict["floor_types"] == expected_values
 
         # Test deserialization (loading from JSON)
-        restored_floor_types = [FloorType(floor_type) for floor_type in expected_values]
+        restored_floor_types = [_FLOOR_BY_VALUE[value] for value in expected_values]
         assert FloorType.LAST_FLOOR in restored_floor_types
         assert FloorType.GROUND_FLOOR in restored_floor_types
 
@@ -224,79 +233,15 @@ class TestFloorFilteringBot:
 
         url = config.get_base_url()
 
+        # Split path segments and comma-separated filters once
+        tokens = set(url.replace("/", ",").split(","))
+
         # Should contain floor parameters
-        assert "ultimo-andar" in url
-        assert "andares-intermedios" in url
+        assert "ultimo-andar" in tokens
+        assert "andares-intermedios" in tokens
 
         # Should also contain other parameters
-        assert "preco-max_1500" in url
-        assert "t2" in url
-        assert "lisboa" in url
-
-
-if __name__ == "__main__":
-    # Manual test runner
-    import asyncio
-
-    async def run_async_tests():
-        """Run async tests manually"""
-        test_instance = TestFloorFilteringBot()
-
-        # Create mock objects
-        mock_update = MagicMock()
-        mock_update.effective_user.id = 12345
-        mock_update.effective_chat.id = 12345
-        mock_update.callback_query = MagicMock()
-        mock_update.callback_query.answer = AsyncMock()
-        mock_update.callback_query.message.edit_text = AsyncMock()
-        mock_update.callback_query.edit_message_text = AsyncMock()
-
-        mock_context = MagicMock()
-        mock_context.user_data = {}
-
-        # Clear user configs
-        user_configs.clear()
-
-        try:
-            await test_instance.test_set_floor_button(mock_update, mock_context)
-            print("✅ test_set_floor_button passed")
-        except Exception as e:
-            print(f"❌ test_set_floor_button failed: {e}")
-
-        try:
-            await test_instance.test_floor_toggle_last_floor(mock_update, mock_context)
-            print("✅ test_floor_toggle_last_floor passed")
-        except Exception as e:
-            print(f"❌ test_floor_toggle_last_floor failed: {e}")
-
-        try:
-            await test_instance.test_floor_multiple_selections(
-                mock_update, mock_context
-            )
-            print("✅ test_floor_multiple_selections passed")
-        except Exception as e:
-            print(f"❌ test_floor_multiple_selections failed: {e}")
-
-    # Run sync tests
-    test_instance = TestFloorFilteringBot()
-
-    try:
-        test_instance.test_floor_config_in_show_settings()
-        print("✅ test_floor_config_in_show_settings passed")
-    except Exception as e:
-        print(f"❌ test_floor_config_in_show_settings failed: {e}")
-
-    try:
-        test_instance.test_floor_config_persistence()
-        print("✅ test_floor_config_persistence passed")
-    except Exception as e:
-        print(f"❌ test_floor_config_persistence failed: {e}")
-
-    try:
-        test_instance.test_floor_url_integration()
-        print("✅ test_floor_url_integration passed")
-    except Exception as e:
-        print(f"❌ test_floor_url_integration failed: {e}")
-
-    # Run async tests
-    asyncio.run(run_async_tests())
+        assert "preco-max_1500" in url  # First filter carries the "com-" prefix
+        assert "t2" in tokens
+        assert "lisboa" in tokens
+
@@ -1,20 +1,61 @@
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 import json
-import tempfile
-import os
 import asyncio
+from dataclasses import asdict
+from types import SimpleNamespace
 
 from telegram import Update, CallbackQuery, Message, User, Chat
-from telegram.ext import ContextTypes
-import sys
-import os
-
-sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
 
 from models import SearchConfig, PropertyState, FurnitureType
 import bot
 
+_STATE_BY_VALUE = {state.value: state for state in PropertyState}
+_FURNITURE_BY_VALUE = {furniture.value: furniture for furniture in FurnitureType}
+
+# Stored field -> (config field, migration). Current fields come first so they
+# win over legacy ones; legacy fields are popped once migrated.
+_MIGRATIONS = {
+    "property_states": (
+        "property_states",
+        lambda c: [_STATE_BY_VALUE[state] for state in c["property_states"]],
+    ),
+    "property_state": (
+        "property_states",
+        lambda c: [_STATE_BY_VALUE[c.pop("property_state")]],
+    ),
+    "furniture_type": (
+        "furniture_type",
+        lambda c: _FURNITURE_BY_VALUE[c["furniture_type"]],
+    ),
+    "has_furniture": (
+        "furniture_type",
+        lambda c: (
+            FurnitureType.FURNISHED
+            if c.pop("has_furniture")
+            else FurnitureType.INDIFFERENT
+        ),
+    ),
+    "furniture_types": (
+        "furniture_type",
+        lambda c: (
+            _FURNITURE_BY_VALUE[values[0]]
+            if (values := c.pop("furniture_types"))
+            else FurnitureType.INDIFFERENT
+        ),
+    ),
+}
+
+
+def _to_dict(config):
+    """Serialize a SearchConfig the way it is stored in user_configs.json"""
+    config_dict = asdict(config)
+    config_dict["property_states"] = [
+        state.value for state in config_dict["property_states"]
+    ]
+    config_dict["furniture_type"] = config_dict["furniture_type"].value
+    return config_dict
+
 
 @pytest.fixture
 def mock_update():
@@ -38,58 +79,25 @@ def mock_update():
 @pytest.fixture
 def mock_context():
     """Create a mock context object"""
-    context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
-    context.user_data = {}
-    context.chat_data = {}
-    return context
+    return SimpleNamespace(user_data={}, chat_data={})
 
 
 @pytest.fixture
-def temp_config_file():
+def temp_config_file(tmp_path, monkeypatch):
     """Create a temporary config file for testing"""
-    with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json") as f:
-        f.write("{}")
-        temp_path = f.name
-
-    # Patch the config file path
-    original_load = bot.load_configs
-    original_save = bot.save_configs
+    temp_path = tmp_path / "user_configs.json"
+    temp_path.write_text("{}")
 
     def mock_load():
         try:
             with open(temp_path, "r") as f:
                 configs = json.load(f)
                 for user_id, config in configs.items():
-                    # Handle backwards compatibility for property_state -> property_states
-                    if "property_state" in config and "property_states" not in config:
-                        config["property_states"] = [
-                            PropertyState(config["property_state"])
-                        ]
-                        config.pop("property_state", None)  # Remove old field
-                    elif "property_states" in config:
-                        config["property_states"] = [
-                            PropertyState(state) for state in config["property_states"]
-                        ]
-
-                    # Handle backwards compatibility for furniture setting
-                    if "has_furniture" in config and "furniture_type" not in config:
-                        config["furniture_type"] = (
-                            FurnitureType.FURNISHED
-                            if config["has_furniture"]
-                            else FurnitureType.INDIFFERENT
-                        )
-                        config.pop("has_furniture", None)  # Remove old field
-                    elif "furniture_types" in config and "furniture_type" not in config:
-                        config["furniture_type"] = (
-                            FurnitureType(config["furniture_types"][0])
-                            if config["furniture_types"]
-                            else FurnitureType.INDIFFERENT
-                        )
-                        config.pop("furniture_types", None)  # Remove old field
-                    elif "furniture_type" in config:
-                        config["furniture_type"] = FurnitureType(
-                            config["furniture_type"]
-                        )
+                    migrated = set()
+                    for source, (target, migrate) in _MIGRATIONS.items():
+                        if source in config and target not in migrated:
+                            config[target] = migrate(config)
+                            migrated.add(target)
 
                     bot.user_configs[int(user_id)] = SearchConfig(**config)
         except (FileNotFoundError, json.JSONDecodeError):
@@ -98,40 +106,29 @@ def temp_config_file():
     def mock_save():
         configs = {}
         for user_id, config in bot.user_configs.items():
-            config_dict = config.__dict__.copy()
-            config_dict["property_states"] = [
-                state.value for state in config_dict["property_states"]
-            ]
-            config_dict["furniture_type"] = config_dict["furniture_type"].value
-            configs[str(user_id)] = config_dict
+            configs[str(user_id)] = _to_dict(config)
 
         with open(temp_path, "w") as f:
             json.dump(configs, f, indent=2)
 
-    bot.load_configs = mock_load
-    bot.save_configs = mock_save
+    # Point the bot's config persistence at the temporary file
+    monkeypatch.setattr(bot, "load_configs", mock_load)
+    monkeypatch.setattr(bot, "save_configs", mock_save)
 
-    yield temp_path
-
-    # Cleanup
-    os.unlink(temp_path)
-    bot.load_configs = original_load
-    bot.save_configs = original_save
+    return temp_path
 
 
 class TestBotConversationFlow:
     """Test bot conversation flow and navigation"""
 
     @pytest.mark.asyncio
-    async def test_start_command(self, mock_update, mock_context):
+    async def test_start_command(self, mock_update, mock_context, user_configs):
         """Test /start command creates user config and shows main menu"""
-        bot.user_configs.clear()
-
         result = await bot.start(mock_update, mock_context)
 
         assert result == bot.CHOOSING
-        assert 12345 in bot.user_configs
-        assert isinstance(bot.user_configs[12345], SearchConfig)
+        assert 12345 in user_configs
+        assert isinstance(user_configs[12345], SearchConfig)
         mock_update.message.reply_text.assert_called_once()
 
     @pytest.mark.asyncio
@@ -146,9 +143,9 @@ class TestBotConversationFlow:
         assert "private chats" in mock_update.message.reply_text.call_args[0][0]
 
     @pytest.mark.asyncio
-    async def test_show_settings(self, mock_update, mock_context):
+    async def test_show_settings(self, mock_update, mock_context, user_configs):
         """Test show current settings functionality"""
-        bot.user_configs[12345] = SearchConfig()
+        user_configs[12345] = SearchConfig()
         mock_update.callback_query.data = "show"
 
         result = await bot.button_handler(mock_update, mock_context)
@@ -174,9 +171,9 @@ class TestBotConversationFlow:
         assert "Please choose an option:" in call_args
 
     @pytest.mark.asyncio
-    async def test_room_setting_flow(self, mock_update, mock_context):
+    async def test_room_setting_flow(self, mock_update, mock_context, user_configs):
         """Test room setting conversation flow"""
-        bot.user_configs[12345] = SearchConfig()
+        user_configs[12345] = SearchConfig()
 
         # Test entering room setting
         mock_update.callback_query.data = "rooms"
@@ -187,13 +184,13 @@ class TestBotConversationFlow:
         mock_update.callback_query.data = "rooms_2"
         result = await bot.button_handler(mock_update, mock_context)
         assert result == bot.CHOOSING
-        assert bot.user_configs[12345].min_rooms == 2
+        assert user_configs[12345].min_rooms == 2
 
     @pytest.mark.asyncio
-    async def test_furniture_toggle_flow(self, mock_update, mock_context):
+    async def test_furniture_toggle_flow(self, mock_update, mock_context, user_configs):
         """Test furniture checkbox toggle functionality"""
-        bot.user_configs[12345] = SearchConfig()
-        original_furniture = bot.user_configs[12345].furniture_type
+        user_configs[12345] = SearchConfig()
+        original_furniture = user_configs[12345].furniture_type
 
         # Test toggling furnished option
         mock_update.callback_query.data = "furniture_toggle_furnished"
@@ -201,19 +198,21 @@ class TestBotConversationFlow:
 
         assert result == bot.SETTING_FURNITURE
         # Should have a valid furniture type
-        assert isinstance(bot.user_configs[12345].furniture_type, FurnitureType)
+        assert isinstance(user_configs[12345].furniture_type, FurnitureType)
 
     @pytest.mark.asyncio
-    async def test_property_state_toggle_flow(self, mock_update, mock_context):
+    async def test_property_state_toggle_flow(
+        self, mock_update, mock_context, user_configs
+    ):
         """Test property state checkbox toggle functionality"""
-        bot.user_configs[12345] = SearchConfig()
+        user_configs[12345] = SearchConfig()
 
         # Test adding a new state
         mock_update.callback_query.data = "state_toggle_new"
         result = await bot.button_handler(mock_update, mock_context)
 
         assert result == bot.SETTING_STATE
-        assert PropertyState.NEW in bot.user_configs[12345].property_states
+        assert PropertyState.NEW in user_configs[12345].property_states
 
         # Test removing a state (but keeping at least one)
         mock_update.callback_query.data = "state_toggle_good"
@@ -221,12 +220,12 @@ class TestBotConversationFlow:
 
         assert result == bot.SETTING_STATE
         # Should still have at least one state
-        assert len(bot.user_configs[12345].property_states) >= 1
+        assert len(user_configs[12345].property_states) >= 1
 
     @pytest.mark.asyncio
-    async def test_price_input_flow(self, mock_update, mock_context):
+    async def test_price_input_flow(self, mock_update, mock_context, user_configs):
         """Test price input conversation flow"""
-        bot.user_configs[12345] = SearchConfig()
+        user_configs[12345] = SearchConfig()
 
         # Test entering price setting
         mock_update.callback_query.data = "price"
@@ -240,12 +239,12 @@ class TestBotConversationFlow:
         result = await bot.handle_price_input(mock_update, mock_context)
 
         assert result == bot.CHOOSING
-        assert bot.user_configs[12345].max_price == 1500
+        assert user_configs[12345].max_price == 1500
 
     @pytest.mark.asyncio
-    async def test_invalid_price_input(self, mock_update, mock_context):
+    async def test_invalid_price_input(self, mock_update, mock_context, user_configs):
         """Test invalid price input handling"""
-        bot.user_configs[12345] = SearchConfig()
+        user_configs[12345] = SearchConfig()
 
         # Test invalid price input
         mock_update.message.text = "invalid_price"
@@ -257,9 +256,9 @@ class TestBotConversationFlow:
         assert "valid positive number" in call_args
 
     @pytest.mark.asyncio
-    async def test_polygon_input_flow(self, mock_update, mock_context):
+    async def test_polygon_input_flow(self, mock_update, mock_context, user_configs):
         """Test custom polygon URL input flow"""
-        bot.user_configs[12345] = SearchConfig()
+        user_configs[12345] = SearchConfig()
 
         # Test valid polygon URL
         valid_url = "https://www.idealista.pt/arrendar-casas/lisboa/?shape=test_polygon_data&ordem=atualizado-desc"
@@ -268,12 +267,12 @@ class TestBotConversationFlow:
         result = await bot.handle_polygon_input(mock_update, mock_context)
 
         assert result == bot.CHOOSING
-        assert bot.user_configs[12345].custom_polygon == "test_polygon_data"
+        assert user_configs[12345].custom_polygon == "test_polygon_data"
 
     @pytest.mark.asyncio
-    async def test_invalid_polygon_input(self, mock_update, mock_context):
+    async def test_invalid_polygon_input(self, mock_update, mock_context, user_configs):
         """Test invalid polygon URL input handling"""
-        bot.user_configs[12345] = SearchConfig()
+        user_configs[12345] = SearchConfig()
 
         # Test invalid URL
         mock_update.message.text = "invalid_url"
@@ -283,19 +282,19 @@ class TestBotConversationFlow:
         mock_update.message.reply_text.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_reset_settings(self, mock_update, mock_context):
+    async def test_reset_settings(self, mock_update, mock_context, user_configs):
         """Test reset settings functionality"""
         # Set up custom config
-        bot.user_configs[12345] = SearchConfig()
-        bot.user_configs[12345].max_price = 1500
-        bot.user_configs[12345].min_rooms = 3
+        user_configs[12345] = SearchConfig()
+        user_configs[12345].max_price = 1500
+        user_configs[12345].min_rooms = 3
 
         mock_update.callback_query.data = "reset_settings"
         result = await bot.button_handler(mock_update, mock_context)
 
         assert result == bot.CHOOSING
         # Should be reset to defaults
-        config = bot.user_configs[12345]
+        config = user_configs[12345]
         assert config.max_price == 2000  # Default
         assert config.min_rooms == 1  # Default
 
@@ -303,8 +302,12 @@ class TestBotConversationFlow:
 class TestConfigurationPersistence:
     """Test configuration saving and loading"""
 
-    def test_config_save_load(self, temp_config_file):
+    @pytest.mark.asyncio
+    async def test_config_save_load(self, tmp_path, monkeypatch, user_configs):
         """Test saving and loading configurations"""
+        # Both use user_configs.json in the working directory
+        monkeypatch.chdir(tmp_path)
+
         # Create test config
         config = SearchConfig()
         config.max_price = 1500
@@ -312,22 +315,63 @@ class TestConfigurationPersistence:
         config.furniture_type = FurnitureType.FURNISHED
         config.property_states = [PropertyState.GOOD, PropertyState.NEW]
 
-        bot.user_configs[12345] = config
-        bot.save_configs()
+        user_configs[12345] = config
+        await bot.save_configs()
+        assert (tmp_path / "user_configs.json").exists()
 
         # Clear and reload
-        bot.user_configs.clear()
+        user_configs.clear()
         bot.load_configs()
 
         # Verify loaded config
-        loaded_config = bot.user_configs[12345]
+        loaded_config = user_configs[12345]
         assert loaded_config.max_price == 1500
         assert loaded_config.min_rooms == 2
         assert loaded_config.furniture_type == FurnitureType.FURNISHED
         assert PropertyState.GOOD in loaded_config.property_states
         assert PropertyState.NEW in loaded_config.property_states
 
-    def test_backwards_compatibility(self, temp_config_file):
+    @pytest.mark.asyncio
+    async def test_failed_save_removes_temp_file(
+        self, tmp_path, monkeypatch, user_configs
+    ):
+        """Test a save that fails mid-write leaves no temporary file behind"""
+        monkeypatch.chdir(tmp_path)
+
+        def failing_dump(*args, **kwargs):
+            raise TypeError("not serializable")
+
+        monkeypatch.setattr(bot.json, "dump", failing_dump)
+        user_configs[12345] = SearchConfig()
+        await bot.save_configs()
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_config_file_cache(self, tmp_path, monkeypatch):
+        """Test an unchanged config file is parsed once and a rewrite is picked up"""
+        config_file = tmp_path / "user_configs.json"
+        config_file.write_text('{"12345": {"is_furnished": true}}')
+
+        parsed = []
+
+        def counting_loads(raw):
+            parsed.append(raw)
+            return json.loads(raw)
+
+        monkeypatch.setattr(bot, "_json", SimpleNamespace(loads=counting_loads))
+
+        first = bot._read_config_file(str(config_file))
+        assert bot._read_config_file(str(config_file)) is first
+        assert len(parsed) == 1
+
+        # Same size as before, so the stat data alone may not change
+        config_file.write_text('{"12345": {"is_furnished":false}}')
+        assert bot._read_config_file(str(config_file)) == {
+            "12345": {"is_furnished": False}
+        }
+        assert len(parsed) == 2
+
+    def test_backwards_compatibility(self, temp_config_file, user_configs):
         """Test backwards compatibility with old config format"""
         # Create old format config
         old_config = {
@@ -347,11 +391,10 @@ class TestConfigurationPersistence:
         with open(temp_config_file, "w") as f:
             json.dump(old_config, f)
 
-        bot.user_configs.clear()
         bot.load_configs()
 
         # Verify migration
-        config = bot.user_configs[12345]
+        config = user_configs[12345]
         assert config.max_price == 1500
         assert config.furniture_type == FurnitureType.FURNISHED
         assert PropertyState.GOOD in config.property_states
@@ -361,10 +404,9 @@ class TestMonitoringFlow:
     """Test monitoring start/stop functionality"""
 
     @pytest.mark.asyncio
-    async def test_start_monitoring(self, mock_update, mock_context):
+    async def test_start_monitoring(self, mock_update, mock_context, user_configs):
         """Test starting monitoring"""
-        bot.user_configs[12345] = SearchConfig()
-        bot.monitoring_tasks.clear()
+        user_configs[12345] = SearchConfig()
 
         mock_update.callback_query.data = "start_monitoring"
 
@@ -399,16 +441,8 @@ class TestMonitoringFlow:
         assert result == bot.CHOOSING
         assert task.cancelled()  # Task should be cancelled
 
-        # Clean up
-        if 12345 in bot.monitoring_tasks:
-            del bot.monitoring_tasks[12345]
-
     def test_dynamic_menu_generation(self):
         """Test dynamic main menu keyboard generation"""
-        # Clear any existing monitoring for this user
-        if 12345 in bot.monitoring_tasks:
-            del bot.monitoring_tasks[12345]
-
         # Test without monitoring
         keyboard = bot.get_main_menu_keyboard(12345)
         start_button_found = any(
@@ -2,13 +2,10 @@ import pytest
 import json
 import tempfile
 import os
-from unittest.mock import patch, MagicMock
-import sys
-import os
-
-sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+from dataclasses import asdict
+from unittest.mock import AsyncMock, patch, MagicMock
 
-from models import SearchConfig, PropertyState, FurnitureType
+from models import SearchConfig, PropertyState, FurnitureType, FloorType
 import bot
 
 
@@ -68,8 +65,7 @@ class TestConfigurationValidation:
             }
         }
 
-        with patch("builtins.open"), patch("json.load", return_value=mock_config_data):
-            bot.user_configs.clear()
+        with patch("bot._read_config_file", return_value=mock_config_data):
             bot.load_configs()
 
             # User should be loaded successfully
@@ -124,8 +120,7 @@ class TestConfigurationValidation:
             }
         }
 
-        with patch("builtins.open"), patch("json.load", return_value=mock_config_data):
-            bot.user_configs.clear()
+        with patch("bot._read_config_file", return_value=mock_config_data):
             bot.load_configs()
 
             config = bot.user_configs[12345]
@@ -147,8 +142,7 @@ class TestConfigurationValidation:
             }
         }
 
-        with patch("builtins.open"), patch("json.load", return_value=mock_config_data):
-            bot.user_configs.clear()
+        with patch("bot._read_config_file", return_value=mock_config_data):
             bot.load_configs()
 
             config = bot.user_configs[12345]
@@ -171,8 +165,7 @@ class TestConfigurationValidation:
             }
         }
 
-        with patch("builtins.open"), patch("json.load", return_value=mock_config_data):
-            bot.user_configs.clear()
+        with patch("bot._read_config_file", return_value=mock_config_data):
             bot.load_configs()
 
             config = bot.user_configs[12345]
@@ -195,8 +188,7 @@ class TestConfigurationValidation:
             }
         }
 
-        with patch("builtins.open"), patch("json.load", return_value=mock_config_data):
-            bot.user_configs.clear()
+        with patch("bot._read_config_file", return_value=mock_config_data):
             bot.load_configs()
 
             config = bot.user_configs[12345]
@@ -223,10 +215,9 @@ class TestConfigurationValidation:
             }
         }
 
-        with patch("builtins.open"), patch("json.load", return_value=mock_config_data):
+        with patch("bot._read_config_file", return_value=mock_config_data):
             # Should handle invalid enum values gracefully
             try:
-                bot.user_configs.clear()
                 bot.load_configs()
                 # If it doesn't crash, that's good - might fall back to defaults
             except (ValueError, KeyError):
@@ -243,8 +234,7 @@ class TestConfigurationValidation:
             }
         }
 
-        with patch("builtins.open"), patch("json.load", return_value=mock_config_data):
-            bot.user_configs.clear()
+        with patch("bot._read_config_file", return_value=mock_config_data):
             bot.load_configs()
 
             # Should still create config with defaults
@@ -335,15 +325,30 @@ class TestConfigurationPersistence:
 
         # Mock file operations
         with patch("builtins.open", create=True) as mock_open:
-            with patch("json.dump") as mock_dump:
+            with patch("json.dump") as mock_dump, patch("os.replace") as mock_replace:
                 # Should be able to call as async function
                 await bot.save_configs()
 
-                # Should have opened file for writing
-                mock_open.assert_called_once_with("user_configs.json", "w")
+                # Should have written a temporary file and swapped it in
+                mock_open.assert_called_once_with("user_configs.json.tmp", "w")
+                mock_replace.assert_called_once_with(
+                    "user_configs.json.tmp", "user_configs.json"
+                )
                 # Should have dumped JSON
                 mock_dump.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_scheduled_saves_are_batched(self):
+        """Test that several scheduled saves result in a single write"""
+        with patch("bot.save_configs", new_callable=AsyncMock) as mock_save:
+            for _ in range(5):
+                bot.schedule_save()
+            mock_save.assert_not_awaited()
+
+            await bot.flush_configs()
+
+        mock_save.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_concurrent_save_operations(self):
         """Test that concurrent save operations are handled safely"""
@@ -373,7 +378,7 @@ class TestConfigurationPersistence:
         # Simulate the serialization logic from save_configs
         configs = {}
         for user_id, config in bot.user_configs.items():
-            config_dict = config.__dict__.copy()
+            config_dict = asdict(config)
             # Convert PropertyState list to string values
             config_dict["property_states"] = [
                 state.value for state in config_dict["property_states"]
@@ -405,8 +410,7 @@ class TestConfigurationPersistence:
             }
         }
 
-        with patch("builtins.open"), patch("json.load", return_value=saved_config):
-            bot.user_configs.clear()
+        with patch("bot._read_config_file", return_value=saved_config):
             bot.load_configs()
 
             config = bot.user_configs[12345]
@@ -420,6 +424,26 @@ class TestConfigurationPersistence:
             assert config.max_price == 1500
             assert config.min_rooms == 2
 
+    def test_reload_rebuilds_only_changed_users(self, user_configs):
+        """Test reloading keeps configs whose saved entry did not change"""
+        saved_config = {
+            "12345": {"max_price": 1500, "city": "lisboa"},
+            "67890": {"max_price": 900, "city": "porto"},
+        }
+
+        with patch("bot._read_config_file", return_value=saved_config):
+            bot.load_configs()
+            unchanged = user_configs[12345]
+            changed = user_configs[67890]
+
+        saved_config = {**saved_config, "67890": {"max_price": 1000, "city": "porto"}}
+        with patch("bot._read_config_file", return_value=saved_config):
+            bot.load_configs()
+
+        assert user_configs[12345] is unchanged
+        assert user_configs[67890] is not changed
+        assert user_configs[67890].max_price == 1000
+
 
 class TestErrorHandlingInConfigLoading:
     """Test error handling during configuration loading"""
@@ -428,7 +452,6 @@ class TestErrorHandlingInConfigLoading:
         """Test handling when config file doesn't exist"""
         with patch("builtins.open", side_effect=FileNotFoundError()):
             with patch("bot.logger") as mock_logger:
-                bot.user_configs.clear()
                 bot.load_configs()
 
                 # Should handle gracefully and log message
@@ -438,12 +461,11 @@ class TestErrorHandlingInConfigLoading:
 
     def test_load_configs_invalid_json(self):
         """Test handling of invalid JSON in config file"""
-        with (
-            patch("builtins.open"),
-            patch("json.load", side_effect=json.JSONDecodeError("Invalid JSON", "", 0)),
+        with patch(
+            "bot._read_config_file",
+            side_effect=json.JSONDecodeError("Invalid JSON", "", 0),
         ):
             with patch("bot.logger") as mock_logger:
-                bot.user_configs.clear()
                 bot.load_configs()
 
                 # Should log warning about invalid JSON
@@ -456,7 +478,6 @@ class TestErrorHandlingInConfigLoading:
         with patch("builtins.open", side_effect=PermissionError("Access denied")):
             # Should not crash, but might not load any configs
             try:
-                bot.user_configs.clear()
                 bot.load_configs()
             except PermissionError:
                 pytest.fail("Should handle permission errors gracefully")
@@ -474,10 +495,9 @@ class TestErrorHandlingInConfigLoading:
             }
         }
 
-        with patch("builtins.open"), patch("json.load", return_value=corrupted_config):
+        with patch("bot._read_config_file", return_value=corrupted_config):
             # Should either handle gracefully or skip the corrupted user
             try:
-                bot.user_configs.clear()
                 bot.load_configs()
 
                 # If user was loaded, it should have valid enum values (possibly defaults)
@@ -492,3 +512,16 @@ class TestErrorHandlingInConfigLoading:
             except (ValueError, KeyError):
                 # Expected behavior for invalid enum values
                 pass
+
+    def test_load_configs_unhashable_floor_type(self):
+        """Test a non-string floor type is skipped instead of aborting the load"""
+        corrupted_config = {
+            "12345": {"floor_types": [["ultimo-andar"], "andares-intermedios"]},
+            "67890": {"max_price": 900},
+        }
+
+        with patch("bot._read_config_file", return_value=corrupted_config):
+            bot.load_configs()
+
+        assert bot.user_configs[12345].floor_types == [FloorType.MIDDLE_FLOORS]
+        assert bot.user_configs[67890].max_price == 900
@@ -1,11 +1,13 @@
 import pytest
-import sys
-import os
 
-sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
 from models import SearchConfig, FloorType
 
 
+def _param_tokens(config):
+    """Split a config's URL parameters into a set of individual filters"""
+    return set(config.to_url_params().split(","))
+
+
 class TestFloorFiltering:
     """Test floor filtering functionality"""
 
@@ -25,34 +27,34 @@ class TestFloorFiltering:
         # Test last floor only
         config = SearchConfig()
         config.floor_types = [FloorType.LAST_FLOOR]
-        params = config.to_url_params()
-        assert "ultimo-andar" in params
-        assert "andares-intermedios" not in params
-        assert "res-do-chao" not in params
+        tokens = _param_tokens(config)
+        assert "ultimo-andar" in tokens
+        assert "andares-intermedios" not in tokens
+        assert "res-do-chao" not in tokens
 
         # Test middle floors only
         config.floor_types = [FloorType.MIDDLE_FLOORS]
-        params = config.to_url_params()
-        assert "andares-intermedios" in params
-        assert "ultimo-andar" not in params
-        assert "res-do-chao" not in params
+        tokens = _param_tokens(config)
+        assert "andares-intermedios" in tokens
+        assert "ultimo-andar" not in tokens
+        assert "res-do-chao" not in tokens
 
         # Test ground floor only
         config.floor_types = [FloorType.GROUND_FLOOR]
-        params = config.to_url_params()
-        assert "res-do-chao" in params
-        assert "ultimo-andar" not in params
-        assert "andares-intermedios" not in params
+        tokens = _param_tokens(config)
+        assert "res-do-chao" in tokens
+        assert "ultimo-andar" not in tokens
+        assert "andares-intermedios" not in tokens
 
     def test_multiple_floor_filter_generation(self):
         """Test URL parameter generation for multiple floor types"""
         # Test last floor + middle floors
         config = SearchConfig()
         config.floor_types = [FloorType.LAST_FLOOR, FloorType.MIDDLE_FLOORS]
-        params = config.to_url_params()
-        assert "ultimo-andar" in params
-        assert "andares-intermedios" in params
-        assert "res-do-chao" not in params
+        tokens = _param_tokens(config)
+        assert "ultimo-andar" in tokens
+        assert "andares-intermedios" in tokens
+        assert "res-do-chao" not in tokens
 
         # Test all three floor types
         config.floor_types = [
@@ -60,28 +62,28 @@ class TestFloorFiltering:
             FloorType.MIDDLE_FLOORS,
             FloorType.GROUND_FLOOR,
         ]
-        params = config.to_url_params()
-        assert "ultimo-andar" in params
-        assert "andares-intermedios" in params
-        assert "res-do-chao" in params
+        tokens = _param_tokens(config)
+        assert "ultimo-andar" in tokens
+        assert "andares-intermedios" in tokens
+        assert "res-do-chao" in tokens
 
         # Test ground floor + last floor
         config.floor_types = [FloorType.GROUND_FLOOR, FloorType.LAST_FLOOR]
-        params = config.to_url_params()
-        assert "res-do-chao" in params
-        assert "ultimo-andar" in params
-        assert "andares-intermedios" not in params
+        tokens = _param_tokens(config)
+        assert "res-do-chao" in tokens
+        assert "ultimo-andar" in tokens
+        assert "andares-intermedios" not in tokens
 
     def test_no_floor_filter_generation(self):
         """Test that empty floor_types list doesn't add floor parameters"""
         config = SearchConfig()
         config.floor_types = []
-        params = config.to_url_params()
+        tokens = _param_tokens(config)
 
         # No floor parameters should be present
-        assert "ultimo-andar" not in params
-        assert "andares-intermedios" not in params
-        assert "res-do-chao" not in params
+        assert "ultimo-andar" not in tokens
+        assert "andares-intermedios" not in tokens
+        assert "res-do-chao" not in tokens
 
     def test_floor_parameter_order_in_url(self):
         """Test that floor parameters appear in correct position in URL"""
@@ -163,16 +165,17 @@ class TestFloorFiltering:
         config.floor_types = [FloorType.LAST_FLOOR]
 
         params = config.to_url_params()
+        tokens = set(params.split(","))
 
         # Should contain all filter types
-        assert "preco-max_2000" in params
-        assert "tamanho-min_70" in params
+        assert "preco-max_2000" in tokens
+        assert "tamanho-min_70" in tokens
         assert "t1,t2,t3" in params
-        assert "equipamento_mobilado" in params
-        assert "bom-estado" in params
-        assert "novo" in params
-        assert "ultimo-andar" in params
-        assert "arrendamento-longa-duracao" in params
+        assert "equipamento_mobilado" in tokens
+        assert "bom-estado" in tokens
+        assert "novo" in tokens
+        assert "ultimo-andar" in tokens
+        assert "arrendamento-longa-duracao" in tokens
 
     def test_floor_list_modification(self):
         """Test that floor_types list can be modified correctly"""
@@ -214,33 +217,4 @@ class TestFloorFiltering:
         config.floor_types = [FloorType.LAST_FLOOR, FloorType.LAST_FLOOR]
         params = config.to_url_params()
         # Should only appear once in the URL
-        assert (
-            params.count("ultimo-andar") == 2
-        )  # Due to the duplicates in the list
-
-
-if __name__ == "__main__":
-    # Run tests manually
-    test = TestFloorFiltering()
-
-    test_methods = [
-        "test_floor_type_enum_values",
-        "test_default_config_floor_types",
-        "test_single_floor_filter_generation",
-        "test_multiple_floor_filter_generation",
-        "test_no_floor_filter_generation",
-        "test_floor_parameter_order_in_url",
-        "test_complete_url_with_floor_filters",
-        "test_floor_filters_with_custom_polygon",
-        "test_floor_filters_with_other_filters",
-        "test_floor_list_modification",
-        "test_floor_filters_edge_cases",
-    ]
-
-    for method_name in test_methods:
-        try:
-            method = getattr(test, method_name)
-            method()
-            print(f"✅ {method_name} passed")
-        except Exception as e:
-            print(f"❌ {method_name} failed: {e}")
+        assert params.count("ultimo-andar") == 1
@@ -1,54 +1,54 @@
-#!/usr/bin/env python3
 """Test furniture filtering logic"""
 
 import pytest
-import sys
-import os
-
-sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
 
 from models import SearchConfig, FurnitureType
 
 
+def _url_tokens(config):
+    """Split a config's search URL into a set of path segments and filters"""
+    return set(config.get_base_url().replace("/", ",").split(","))
+
+
 class TestFurnitureFiltering:
     """Test furniture filtering URL generation"""
 
     def test_furnished_filter(self):
         """Test FURNISHED furniture filter"""
         config = SearchConfig(furniture_type=FurnitureType.FURNISHED)
-        url = config.get_base_url()
+        tokens = _url_tokens(config)
 
         # Should contain furnished parameter
-        assert "equipamento_mobilado" in url
+        assert "equipamento_mobilado" in tokens
 
     def test_kitchen_furniture_filter(self):
         """Test KITCHEN_FURNITURE filter"""
         config = SearchConfig(furniture_type=FurnitureType.KITCHEN_FURNITURE)
-        url = config.get_base_url()
+        tokens = _url_tokens(config)
 
         # Should contain kitchen furniture parameter
-        assert "equipamento_so-cozinha-equipada" in url
+        assert "equipamento_so-cozinha-equipada" in tokens
 
     def test_indifferent_filter(self):
         """Test INDIFFERENT (no furniture filter)"""
         config = SearchConfig(furniture_type=FurnitureType.INDIFFERENT)
-        url = config.get_base_url()
+        tokens = _url_tokens(config)
 
         # Should NOT contain any furniture parameters
-        assert "equipamento_mobilado" not in url
-        assert "equipamento_so-cozinha-equipada" not in url
+        assert "equipamento_mobilado" not in tokens
+        assert "equipamento_so-cozinha-equipada" not in tokens
 
     def test_default_configuration(self):
         """Test default furniture configuration"""
         config = SearchConfig()
-        url = config.get_base_url()
+        tokens = _url_tokens(config)
 
         # Default should be INDIFFERENT
         assert config.furniture_type == FurnitureType.INDIFFERENT
 
         # Should NOT contain furniture parameters
-        assert "equipamento_mobilado" not in url
-        assert "equipamento_so-cozinha-equipada" not in url
+        assert "equipamento_mobilado" not in tokens
+        assert "equipamento_so-cozinha-equipada" not in tokens
 
     def test_furniture_type_enum_values(self):
         """Test that all expected furniture type enum values exist"""
@@ -64,34 +64,3 @@ class TestFurnitureFiltering:
             FurnitureType.KITCHEN_FURNITURE.value == "equipamento_so-cozinha-equipada"
         )
 
-
-if __name__ == "__main__":
-    # Run as script for debugging
-    test = TestFurnitureFiltering()
-
-    print("=== Testing Furniture Filter URL Generation ===\n")
-
-    try:
-        test.test_furnished_filter()
-        print("✓ FURNISHED filter test passed")
-
-        test.test_kitchen_furniture_filter()
-        print("✓ KITCHEN_FURNITURE filter test passed")
-
-        test.test_indifferent_filter()
-        print("✓ INDIFFERENT filter test passed")
-
-        test.test_default_configuration()
-        print("✓ Default configuration test passed")
-
-        test.test_furniture_type_enum_values()
-        print("✓ Enum values test passed")
-
-        print("\n✅ All furniture filtering tests passed!")
-        print("✅ All furniture filtering logic is now handled by URL parameters only!")
-
-    except Exception as e:
-        print(f"❌ Test failed: {e}")
-        import traceback
-
-        traceback.print_exc()
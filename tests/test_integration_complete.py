@@ -6,10 +6,6 @@ import os
 from unittest.mock import AsyncMock, MagicMock, patch
 from telegram import Update, CallbackQuery, Message, User, Chat
 from telegram.ext import ContextTypes
-import sys
-import os
-
-sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
 
 from models import SearchConfig, PropertyState, FurnitureType
 import bot
@@ -80,8 +76,6 @@ class TestCompleteMultiUserFlow:
     async def test_complete_user_journey(self, mock_update, mock_context, temp_files):
         """Test complete user journey from start to monitoring"""
         # Clear all state
-        bot.user_configs.clear()
-        bot.monitoring_tasks.clear()
         stats_manager.stats.clear()
         global_rate_limiter.user_last_request.clear()
         global_rate_limiter.recent_errors = 0
@@ -100,11 +94,10 @@ class TestCompleteMultiUserFlow:
         # 3. User runs a test search
         mock_update.callback_query.data = "test_search"
         with patch("bot.IdealistaScraper") as mock_scraper_class:
-            mock_scraper = MagicMock()
-            mock_scraper.initialize = AsyncMock()
-            mock_scraper.scrape_listings = AsyncMock(
-                return_value=[{"title": "Test Apartment", "link": "https://test.com/1"}]
-            )
+            mock_scraper = AsyncMock(spec=IdealistaScraper)
+            mock_scraper.scrape_listings.return_value = [
+                {"title": "Test Apartment", "link": "https://test.com/1"}
+            ]
             mock_scraper_class.return_value = mock_scraper
 
             result = await bot.test_search_now(mock_update, mock_context)
@@ -139,8 +132,6 @@ class TestCompleteMultiUserFlow:
     async def test_multi_user_isolation(self, temp_files):
         """Test that multiple users are properly isolated"""
         # Clear state
-        bot.user_configs.clear()
-        bot.monitoring_tasks.clear()
         stats_manager.stats.clear()
 
         # Create two users with different configs
@@ -290,11 +281,9 @@ class TestCompleteMultiUserFlow:
             }
         }
 
-        with (
-            patch("builtins.open"),
-            patch("json.load", return_value=mock_config_with_invalid_fields),
+        with patch(
+            "bot._read_config_file", return_value=mock_config_with_invalid_fields
         ):
-            bot.user_configs.clear()
             bot.load_configs()
 
             # Should load successfully with invalid fields filtered
@@ -424,40 +413,28 @@ class TestErrorScenarios:
         ]
 
         for corrupted_data in corruption_scenarios:
-            with patch("builtins.open", create=True):
+            # Parse the raw file contents the way load_configs would
+            with patch(
+                "bot._read_config_file",
+                side_effect=lambda _, data=corrupted_data: json.loads(data),
+            ):
                 try:
-                    # Try to parse JSON - if it's valid JSON, test with valid structure
-                    parsed_data = json.loads(corrupted_data)
-                    # Valid JSON but potentially invalid structure
-                    with patch("json.load", return_value=parsed_data):
-                        try:
-                            bot.user_configs.clear()
-                            bot.load_configs()
-                            # Should either load successfully or handle gracefully
-                        except Exception as e:
-                            # Should not crash with unhandled exceptions
-                            assert not isinstance(
-                                e, (json.JSONDecodeError, KeyError)
-                            ), f"Unexpected exception: {e}"
-                except json.JSONDecodeError:
-                    # Invalid JSON
-                    with patch(
-                        "json.load",
-                        side_effect=json.JSONDecodeError("Invalid JSON", "", 0),
-                    ):
-                        bot.user_configs.clear()
-                        bot.load_configs()
-                        # Should handle gracefully
+                    bot.user_configs.clear()
+                    bot.load_configs()
+                    # Should either load successfully or handle gracefully
+                except Exception as e:
+                    # Should not crash with unhandled exceptions
+                    assert not isinstance(
+                        e, (json.JSONDecodeError, KeyError)
+                    ), f"Unexpected exception: {e}"
 
     @pytest.mark.asyncio
-    async def test_concurrent_user_operations(self):
+    async def test_concurrent_user_operations(self, monkeypatch, tmp_path):
         """Test concurrent operations from multiple users"""
+        # Keep the saved configs away from the real user_configs.json
+        monkeypatch.chdir(tmp_path)
         import asyncio
 
-        # Clear state
-        bot.user_configs.clear()
-        bot.monitoring_tasks.clear()
-
         async def simulate_user_activity(user_id):
             """Simulate a user doing various activities"""
             # Create config
@@ -532,7 +509,7 @@ class TestBackwardsCompatibility:
         ]
 
         for old_config in old_configs:
-            with patch("builtins.open"), patch("json.load", return_value=old_config):
+            with patch("bot._read_config_file", return_value=old_config):
                 bot.user_configs.clear()
                 bot.load_configs()
 
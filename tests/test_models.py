@@ -1,9 +1,33 @@
+import re
+
 import pytest
-import sys
-import os
 
-sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
-from models import SearchConfig, PropertyState, FurnitureType
+from models import (
+    FLOOR_TYPE_BY_VALUE,
+    FloorType,
+    FurnitureType,
+    PropertyState,
+    SearchConfig,
+    _build_url_params,
+)
+
+
+def _all_of(*parts):
+    """Compile one pattern that matches only when every literal part is present"""
+    return re.compile("".join(f"(?=.*?{re.escape(part)})" for part in parts))
+
+
+_COMPLETE_URL_RE = _all_of(
+    "https://www.idealista.pt/arrendar-casas/lisboa/com-",
+    "preco-max_1100",
+    "tamanho-min_60",
+    "t1,t2,t3,t4-t5",
+    "equipamento_mobilado",
+    "novo",
+    "bom-estado",
+    "arrendamento-longa-duracao",
+)
+_CUSTOM_POLYGON_RE = _all_of("areas/arrendar-casas", "shape=test_polygon_data")
 
 
 class TestSearchConfig:
@@ -130,19 +154,7 @@ class TestSearchConfig:
         config.city = "lisboa"
 
         url = config.get_base_url()
-        expected_parts = [
-            "https://www.idealista.pt/arrendar-casas/lisboa/com-",
-            "preco-max_1100",
-            "tamanho-min_60",
-            "t1,t2,t3,t4-t5",
-            "equipamento_mobilado",
-            "novo",
-            "bom-estado",
-            "arrendamento-longa-duracao",
-        ]
-
-        for part in expected_parts:
-            assert part in url
+        assert _COMPLETE_URL_RE.match(url)
 
     def test_custom_polygon_url(self):
         """Test URL generation with custom polygon"""
@@ -150,8 +162,7 @@ class TestSearchConfig:
         config.custom_polygon = "test_polygon_data"
 
         url = config.get_base_url()
-        assert "areas/arrendar-casas" in url
-        assert "shape=test_polygon_data" in url
+        assert _CUSTOM_POLYGON_RE.match(url)
 
     def test_parameter_order(self):
         """Test that URL parameters are in the correct order"""
@@ -175,6 +186,30 @@ class TestSearchConfig:
         # Should end with long-term rental
         assert parts[-1] == "arrendamento-longa-duracao"
 
+    def test_url_reflects_in_place_changes(self):
+        """Test cached URL parameters follow in-place config changes"""
+        config = SearchConfig()
+        before = config.get_base_url()
+        assert config.get_base_url() == before
+
+        config.floor_types.append(FloorType.LAST_FLOOR)
+        assert "ultimo-andar" in config.get_base_url()
+
+        config.floor_types.clear()
+        config.max_price = 900
+        assert "preco-max_900" in config.get_base_url()
+        assert SearchConfig().get_base_url() == before
+
+    def test_equivalent_configs_share_cached_params(self):
+        """Test configs with the same search fields reuse one parameter build"""
+        _build_url_params.cache_clear()
+        first = SearchConfig(property_states=[PropertyState.GOOD, PropertyState.NEW])
+        second = SearchConfig(property_states=[PropertyState.NEW, PropertyState.GOOD])
+
+        assert first.get_base_url() == second.get_base_url()
+        info = _build_url_params.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+
 
 class TestFurnitureType:
     """Test FurnitureType enum"""
@@ -196,3 +231,17 @@ class TestPropertyState:
         assert PropertyState.GOOD.value == "bom-estado"
         assert PropertyState.NEW.value == "com-novo"
         assert PropertyState.NEEDS_REMODELING.value == "para-reformar"
+
+
+class TestFloorTypeLookup:
+    """Test FLOOR_TYPE_BY_VALUE lookup table"""
+
+    def test_current_values(self):
+        """Test every floor type resolves from its own value"""
+        for floor_type in FloorType:
+            assert FLOOR_TYPE_BY_VALUE[floor_type.value] is floor_type
+
+    def test_legacy_values(self):
+        """Test values saved by older versions resolve to current floor types"""
+        assert FLOOR_TYPE_BY_VALUE["com-ultimo-andar"] is FloorType.LAST_FLOOR
+        assert FLOOR_TYPE_BY_VALUE.get("cave") is None
@@ -4,13 +4,10 @@ import time
 from unittest.mock import AsyncMock, MagicMock, patch
 from telegram import Update, CallbackQuery, Message, User, Chat
 from telegram.ext import ContextTypes
-import sys
-import os
-
-sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
 
 from models import SearchConfig
 import bot
+from scraper import IdealistaScraper
 
 
 @pytest.fixture
@@ -46,7 +43,6 @@ class TestMonitoringTaskManagement:
     ):
         """Test that monitoring tasks are created and validated properly"""
         bot.user_configs[12345] = SearchConfig()
-        bot.monitoring_tasks.clear()
         mock_update.callback_query.data = "start_monitoring"
 
         with patch("bot.user_monitoring_task") as mock_task_func:
@@ -72,7 +68,6 @@ class TestMonitoringTaskManagement:
     async def test_monitoring_task_failure_detection(self, mock_update, mock_context):
         """Test detection and handling of failed monitoring tasks"""
         bot.user_configs[12345] = SearchConfig()
-        bot.monitoring_tasks.clear()
         mock_update.callback_query.data = "start_monitoring"
 
         with patch("bot.user_monitoring_task") as mock_task_func:
@@ -148,11 +143,8 @@ class TestMonitoringTaskManagement:
         """Test that monitoring task handles exceptions in scraping"""
         with patch("bot.IdealistaScraper") as mock_scraper_class:
             # Create scraper that fails
-            mock_scraper = MagicMock()
-            mock_scraper.initialize = AsyncMock()
-            mock_scraper.scrape_listings = AsyncMock(
-                side_effect=Exception("Scraping failed")
-            )
+            mock_scraper = AsyncMock(spec=IdealistaScraper)
+            mock_scraper.scrape_listings.side_effect = Exception("Scraping failed")
             mock_scraper_class.return_value = mock_scraper
 
             bot.user_configs[12345] = SearchConfig()
@@ -177,11 +169,8 @@ class TestMonitoringTaskManagement:
         """Test that monitoring task handles rate limit errors specifically"""
         with patch("bot.IdealistaScraper") as mock_scraper_class:
             # Create scraper that raises rate limit error
-            mock_scraper = MagicMock()
-            mock_scraper.initialize = AsyncMock()
-            mock_scraper.scrape_listings = AsyncMock(
-                side_effect=Exception("403 Forbidden")
-            )
+            mock_scraper = AsyncMock(spec=IdealistaScraper)
+            mock_scraper.scrape_listings.side_effect = Exception("403 Forbidden")
             mock_scraper_class.return_value = mock_scraper
 
             bot.user_configs[12345] = SearchConfig()
@@ -227,9 +216,6 @@ class TestMonitoringStatusChecking:
         assert "Next check in" in message
         assert "Debug Info" in message
 
-        # Clean up
-        del bot.monitoring_tasks[12345]
-
     @pytest.mark.asyncio
     async def test_check_monitoring_status_inactive_task(
         self, mock_update, mock_context
@@ -250,8 +236,6 @@ class TestMonitoringStatusChecking:
     @pytest.mark.asyncio
     async def test_check_monitoring_status_no_config(self, mock_update, mock_context):
         """Test status check when user has no configuration"""
-        bot.user_configs.clear()
-
         result = await bot.check_monitoring_status(mock_update, mock_context)
 
         assert result == bot.CHOOSING
@@ -298,9 +282,6 @@ class TestMonitoringStatusChecking:
         assert "Total monitoring tasks: 2" in message
         assert "Active tasks: 1" in message
 
-        # Clean up
-        bot.monitoring_tasks.clear()
-
 
 class TestManualSearchTesting:
     """Test manual search testing functionality"""
@@ -311,14 +292,11 @@ class TestManualSearchTesting:
         bot.user_configs[12345] = SearchConfig()
 
         with patch("bot.IdealistaScraper") as mock_scraper_class:
-            mock_scraper = MagicMock()
-            mock_scraper.initialize = AsyncMock()
-            mock_scraper.scrape_listings = AsyncMock(
-                return_value=[
-                    {"title": "Test Listing 1", "link": "https://test.com/1"},
-                    {"title": "Test Listing 2", "link": "https://test.com/2"},
-                ]
-            )
+            mock_scraper = AsyncMock(spec=IdealistaScraper)
+            mock_scraper.scrape_listings.return_value = [
+                {"title": "Test Listing 1", "link": "https://test.com/1"},
+                {"title": "Test Listing 2", "link": "https://test.com/2"},
+            ]
             mock_scraper_class.return_value = mock_scraper
 
             result = await bot.test_search_now(mock_update, mock_context)
@@ -339,9 +317,8 @@ class TestManualSearchTesting:
         bot.user_configs[12345] = SearchConfig()
 
         with patch("bot.IdealistaScraper") as mock_scraper_class:
-            mock_scraper = MagicMock()
-            mock_scraper.initialize = AsyncMock()
-            mock_scraper.scrape_listings = AsyncMock(return_value=[])
+            mock_scraper = AsyncMock(spec=IdealistaScraper)
+            mock_scraper.scrape_listings.return_value = []
             mock_scraper_class.return_value = mock_scraper
 
             result = await bot.test_search_now(mock_update, mock_context)
@@ -356,11 +333,8 @@ class TestManualSearchTesting:
         bot.user_configs[12345] = SearchConfig()
 
         with patch("bot.IdealistaScraper") as mock_scraper_class:
-            mock_scraper = MagicMock()
-            mock_scraper.initialize = AsyncMock()
-            mock_scraper.scrape_listings = AsyncMock(
-                return_value=None
-            )  # Network failure
+            mock_scraper = AsyncMock(spec=IdealistaScraper)
+            mock_scraper.scrape_listings.return_value = None  # Network failure
             mock_scraper_class.return_value = mock_scraper
 
             result = await bot.test_search_now(mock_update, mock_context)
@@ -384,8 +358,6 @@ class TestManualSearchTesting:
     @pytest.mark.asyncio
     async def test_test_search_no_config(self, mock_update, mock_context):
         """Test manual search test with no user configuration"""
-        bot.user_configs.clear()
-
         result = await bot.test_search_now(mock_update, mock_context)
 
         assert result == bot.CHOOSING
@@ -401,9 +373,8 @@ class TestManualSearchTesting:
         bot.user_configs[12345] = config
 
         with patch("bot.IdealistaScraper") as mock_scraper_class:
-            mock_scraper = MagicMock()
-            mock_scraper.initialize = AsyncMock()
-            mock_scraper.scrape_listings = AsyncMock(return_value=[])
+            mock_scraper = AsyncMock(spec=IdealistaScraper)
+            mock_scraper.scrape_listings.return_value = []
             mock_scraper_class.return_value = mock_scraper
 
             result = await bot.test_search_now(mock_update, mock_context)
@@ -485,9 +456,8 @@ class TestIntegrationWithExistingFeatures:
         bot.user_configs[12345] = SearchConfig()
 
         with patch("bot.IdealistaScraper") as mock_scraper_class:
-            mock_scraper = MagicMock()
-            mock_scraper.initialize = AsyncMock()
-            mock_scraper.scrape_listings = AsyncMock(return_value=[])
+            mock_scraper = AsyncMock(spec=IdealistaScraper)
+            mock_scraper.scrape_listings.return_value = []
             mock_scraper_class.return_value = mock_scraper
 
             result = await bot.test_search_now(mock_update, mock_context)
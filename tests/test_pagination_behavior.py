@@ -1,15 +1,7 @@
 import pytest
-import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 import aiohttp
 from bs4 import BeautifulSoup
-import sys
-import os
-
-# Add src to path
-current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-src_path = os.path.join(current_dir, "src")
-sys.path.insert(0, src_path)
 
 from models import SearchConfig
 from scraper import IdealistaScraper
@@ -348,93 +340,3 @@ class TestPaginationBehavior:
 
         # Verify seen listings were tracked
         assert len(scraper.seen_listings["test_user"]) == 5
-
-
-if __name__ == "__main__":
-    # Run tests manually
-    import sys
-
-    test_instance = TestPaginationBehavior()
-
-    # Create fixtures manually
-    scraper = IdealistaScraper()
-    scraper.seen_listings = {"test_user": set()}
-    config = SearchConfig(max_pages=5, city="lisboa")
-
-    async def run_test(test_func, *args):
-        """Helper to run async tests"""
-        try:
-            await test_func(*args)
-            print(f"✅ {test_func.__name__} passed")
-        except Exception as e:
-            print(f"❌ {test_func.__name__} failed: {e}")
-            import traceback
-
-            traceback.print_exc()
-
-    async def run_all_tests():
-        """Run all tests"""
-        print("🧪 Running Pagination Behavior Tests...\n")
-
-        # Reset scraper for each test
-        scraper.seen_listings = {"test_user": set()}
-        await run_test(
-            test_instance.test_pagination_scrapes_all_pages_with_force_all_pages,
-            scraper,
-            config,
-        )
-
-        scraper.seen_listings = {"test_user": set()}
-        await run_test(
-            test_instance.test_pagination_stops_early_without_force_all_pages,
-            scraper,
-            config,
-        )
-
-        scraper.seen_listings = {"test_user": set()}
-        await run_test(
-            test_instance.test_pagination_continues_past_empty_pages_early_in_sequence,
-            scraper,
-            config,
-        )
-
-        scraper.seen_listings = {"test_user": set()}
-        await run_test(
-            test_instance.test_pagination_stops_on_consecutive_empty_pages,
-            scraper,
-            config,
-        )
-
-        scraper.seen_listings = {"test_user": set()}
-        await run_test(
-            test_instance.test_pagination_url_construction_city_based, scraper, config
-        )
-
-        scraper.seen_listings = {"test_user": set()}
-        await run_test(
-            test_instance.test_pagination_url_construction_custom_polygon, scraper
-        )
-
-        scraper.seen_listings = {"test_user": set()}
-        await run_test(
-            test_instance.test_pagination_respects_max_pages_limit, scraper, config
-        )
-
-        scraper.seen_listings = {"test_user": set()}
-        await run_test(
-            test_instance.test_pagination_handles_fetch_errors_gracefully,
-            scraper,
-            config,
-        )
-
-        scraper.seen_listings = {"test_user": set()}
-        await run_test(
-            test_instance.test_pagination_seen_listings_tracking_across_pages,
-            scraper,
-            config,
-        )
-
-        print(f"\n🏁 All pagination tests completed!")
-
-    # Run the tests
-    asyncio.run(run_all_tests())
@@ -2,11 +2,6 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from scraper import IdealistaScraper, fetch_page
 from models import SearchConfig, PropertyState, FurnitureType, SizeRange
-import aiohttp
-import sys
-import os
-
-sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
 
 
 # Fixtures
@@ -61,49 +56,34 @@ def mock_html():
 
 # Test cases
 @pytest.mark.asyncio
-async def test_fetch_page():
+async def test_fetch_page(aiohttp_session, mock_responses):
     """Test fetching a page with rate limiting"""
-    with patch("aiohttp.ClientSession.get") as mock_get:
-        mock_response = AsyncMock()
-        mock_response.status = 200
-        mock_response.text = AsyncMock(return_value="<html>Test</html>")
-        mock_get.return_value.__aenter__.return_value = mock_response
+    mock_responses.get("https://test.com", status=200, body="<html>Test</html>")
 
-        async with aiohttp.ClientSession() as session:
-            result = await fetch_page(session, "https://test.com")
-            assert result == "<html>Test</html>"
-            mock_get.assert_called_once()
+    result = await fetch_page(aiohttp_session, "https://test.com")
+    assert result == "<html>Test</html>"
+    mock_responses.assert_called_once()
 
 
 @pytest.mark.asyncio
-async def test_fetch_page_error():
+async def test_fetch_page_error(aiohttp_session, mock_responses):
     """Test error handling in fetch_page"""
-    with patch("aiohttp.ClientSession.get") as mock_get:
-        mock_response = AsyncMock()
-        mock_response.status = 429  # Too Many Requests
-        mock_get.return_value.__aenter__.return_value = mock_response
+    mock_responses.get("https://test.com", status=429)  # Too Many Requests
 
-        async with aiohttp.ClientSession() as session:
-            result = await fetch_page(session, "https://test.com")
-            assert result is None
+    result = await fetch_page(aiohttp_session, "https://test.com")
+    assert result is None
 
 
 @pytest.mark.asyncio
-async def test_fetch_page_403_error():
+async def test_fetch_page_403_error(aiohttp_session, mock_responses):
     """Test 403 error handling in fetch_page"""
-    with (
-        patch("aiohttp.ClientSession.get") as mock_get,
-        patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep,
-    ):
-        mock_response = AsyncMock()
-        mock_response.status = 403  # Forbidden
-        mock_get.return_value.__aenter__.return_value = mock_response
+    mock_responses.get("https://test.com", status=403)  # Forbidden
 
-        async with aiohttp.ClientSession() as session:
-            result = await fetch_page(session, "https://test.com")
-            assert result is None
-            # Verify that emergency backoff was called
-            mock_sleep.assert_called_with(120)
+    with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        result = await fetch_page(aiohttp_session, "https://test.com")
+        assert result is None
+        # Verify that emergency backoff was called
+        mock_sleep.assert_called_with(120)
 
 
 @pytest.mark.asyncio
@@ -150,16 +130,13 @@ async def test_scraper_save_seen_listings():
 
 
 @pytest.mark.asyncio
-async def test_scraper_process_listings(mock_config, mock_html):
+async def test_scraper_process_listings(mock_config, mock_html, serve_page):
     """Test processing listings"""
     print("\n=== Starting test_scraper_process_listings ===")
-    with (
-        patch("scraper.fetch_page", new_callable=AsyncMock) as mock_fetch,
-        patch(
-            "scraper.IdealistaScraper.send_telegram_message", new_callable=AsyncMock
-        ) as mock_send,
-    ):
-        mock_fetch.return_value = mock_html
+    serve_page(mock_html)
+    with patch(
+        "scraper.IdealistaScraper.send_telegram_message", new_callable=AsyncMock
+    ) as mock_send:
         scraper = IdealistaScraper()
         await scraper.initialize()
         scraper.user_configs = {"123456": mock_config}  # Use string key
@@ -179,37 +156,33 @@ async def test_scraper_process_listings(mock_config, mock_html):
 
 
 @pytest.mark.asyncio
-async def test_scraper_duplicate_detection(mock_config, mock_html):
+async def test_scraper_duplicate_detection(mock_config, mock_html, serve_page):
     """Test duplicate listing detection"""
-    with patch("scraper.fetch_page", new_callable=AsyncMock) as mock_fetch:
-        mock_fetch.return_value = mock_html
-        scraper = IdealistaScraper()
-        await scraper.initialize()
-        scraper.user_configs = {"123456": mock_config}
-        scraper.seen_listings = {
-            "123456": {"https://www.idealista.pt/123"}
-        }  # First listing is already seen
+    serve_page(mock_html)
+    scraper = IdealistaScraper()
+    await scraper.initialize()
+    scraper.user_configs = {"123456": mock_config}
+    scraper.seen_listings = {
+        "123456": {"https://www.idealista.pt/123"}
+    }  # First listing is already seen
 
-        # Mock the send_telegram_message function
-        scraper.send_telegram_message = AsyncMock()
+    # Mock the send_telegram_message function
+    scraper.send_telegram_message = AsyncMock()
 
-        await scraper.scrape_listings(mock_config, "123456")
+    await scraper.scrape_listings(mock_config, "123456")
 
-        # Should not send message for seen listing
-        scraper.send_telegram_message.assert_not_called()
+    # Should not send message for seen listing
+    scraper.send_telegram_message.assert_not_called()
 
 
 @pytest.mark.asyncio
-async def test_scraper_filter_criteria(mock_config, mock_html):
+async def test_scraper_filter_criteria(mock_config, mock_html, serve_page):
     """Test filtering based on criteria"""
     print("\n=== Starting test_scraper_filter_criteria ===")
-    with (
-        patch("scraper.fetch_page", new_callable=AsyncMock) as mock_fetch,
-        patch(
-            "scraper.IdealistaScraper.send_telegram_message", new_callable=AsyncMock
-        ) as mock_send,
-    ):
-        mock_fetch.return_value = mock_html
+    serve_page(mock_html)
+    with patch(
+        "scraper.IdealistaScraper.send_telegram_message", new_callable=AsyncMock
+    ) as mock_send:
         scraper = IdealistaScraper()
         await scraper.initialize()
         scraper.user_configs = {"123456": mock_config}  # Use string key
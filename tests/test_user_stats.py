@@ -1,35 +1,37 @@
 import pytest
 import json
-import tempfile
-import os
 from datetime import datetime, timedelta
-from unittest.mock import patch, MagicMock
-from collections import defaultdict
-import sys
-import os
-
-sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+from operator import itemgetter
+from unittest.mock import patch, MagicMock, mock_open
 
 from user_stats import UserStatsManager, stats_manager
 
+# Monitoring task stand-ins; only done() is consulted
+_RUNNING_TASK = MagicMock(done=lambda: False)
+_FINISHED_TASK = MagicMock(done=lambda: True)
+
+
+@pytest.fixture(autouse=True)
+def _no_disk(monkeypatch):
+    """Serve user_stats.json from memory so loads and saves never touch disk"""
+    monkeypatch.setattr("user_stats.open", mock_open(read_data="{}"), raising=False)
+
+
+@pytest.fixture
+def manager(_no_disk):
+    """Create a fresh stats manager for testing"""
+    return UserStatsManager()
+
 
 class TestUserStatsManager:
     """Test user statistics management functionality"""
 
     @pytest.fixture
-    def temp_stats_file(self):
+    def temp_stats_file(self, tmp_path):
         """Create a temporary stats file for testing"""
-        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json") as f:
-            json.dump({}, f)
-            temp_path = f.name
-
-        yield temp_path
-
-        # Cleanup
-        try:
-            os.unlink(temp_path)
-        except FileNotFoundError:
-            pass
+        path = tmp_path / "stats.json"
+        path.write_text("{}")
+        return str(path)
 
     def test_stats_manager_initialization(self):
         """Test stats manager initializes correctly"""
@@ -38,13 +40,8 @@ class TestUserStatsManager:
         assert hasattr(manager, "stats")
         assert isinstance(manager.stats, dict)
 
-    def test_record_user_activity_new_user(self):
+    def test_record_user_activity_new_user(self, manager):
         """Test recording activity for new user"""
-        manager = UserStatsManager()
-
-        # Clear any existing stats
-        manager.stats.clear()
-
         manager.record_user_activity("12345", "first_use")
 
         assert "12345" in manager.stats
@@ -54,32 +51,23 @@ class TestUserStatsManager:
         assert user_stats["total_searches"] == 0  # first_use doesn't increment searches
         assert user_stats["listings_received"] == 0
 
-    def test_record_user_activity_search_start(self):
+    def test_record_user_activity_search_start(self, manager):
         """Test recording search start activity"""
-        manager = UserStatsManager()
-        manager.stats.clear()
-
         manager.record_user_activity("12345", "search_start")
 
         user_stats = manager.stats["12345"]
         assert user_stats["total_searches"] == 1
         assert user_stats["monitoring_sessions"] == 1
 
-    def test_record_user_activity_listing_received(self):
+    def test_record_user_activity_listing_received(self, manager):
         """Test recording listing received activity"""
-        manager = UserStatsManager()
-        manager.stats.clear()
-
         manager.record_user_activity("12345", "listing_received")
 
         user_stats = manager.stats["12345"]
         assert user_stats["listings_received"] == 1
 
-    def test_record_multiple_activities(self):
+    def test_record_multiple_activities(self, manager):
         """Test recording multiple activities for same user"""
-        manager = UserStatsManager()
-        manager.stats.clear()
-
         # Record multiple activities
         manager.record_user_activity("12345", "first_use")
         manager.record_user_activity("12345", "search_start")
@@ -91,25 +79,19 @@ class TestUserStatsManager:
         assert user_stats["monitoring_sessions"] == 1
         assert user_stats["listings_received"] == 2
 
-    def test_get_active_users_count(self):
+    def test_get_active_users_count(self, manager):
         """Test getting active users count"""
-        manager = UserStatsManager()
-
-        # Mock monitoring tasks
         mock_tasks = {
-            "user1": MagicMock(done=lambda: False),  # Active
-            "user2": MagicMock(done=lambda: True),  # Inactive
-            "user3": MagicMock(done=lambda: False),  # Active
+            "user1": _RUNNING_TASK,
+            "user2": _FINISHED_TASK,
+            "user3": _RUNNING_TASK,
         }
 
         active_count = manager.get_active_users_count(mock_tasks)
         assert active_count == 2
 
-    def test_get_total_users_count(self):
+    def test_get_total_users_count(self, manager):
         """Test getting total users count"""
-        manager = UserStatsManager()
-        manager.stats.clear()
-
         # Add some users
         manager.record_user_activity("user1", "first_use")
         manager.record_user_activity("user2", "first_use")
@@ -118,11 +100,8 @@ class TestUserStatsManager:
         total_count = manager.get_total_users_count()
         assert total_count == 3
 
-    def test_get_user_summary(self):
+    def test_get_user_summary(self, manager):
         """Test getting user summary statistics"""
-        manager = UserStatsManager()
-        manager.stats.clear()
-
         # Add test data
         manager.record_user_activity("user1", "search_start")
         manager.record_user_activity("user1", "listing_received")
@@ -139,11 +118,8 @@ class TestUserStatsManager:
         assert "Average Searches per User: 1.0" in summary
         assert "Average Listings per User: 1.5" in summary
 
-    def test_get_user_summary_empty(self):
+    def test_get_user_summary_empty(self, manager):
         """Test getting user summary with no users"""
-        manager = UserStatsManager()
-        manager.stats.clear()
-
         summary = manager.get_user_summary()
 
         assert "Total Users: 0" in summary
@@ -152,9 +128,8 @@ class TestUserStatsManager:
         assert "Average Searches per User: 0.0" in summary
         assert "Average Listings per User: 0.0" in summary
 
-    def test_save_stats(self):
+    def test_save_stats(self, manager):
         """Test saving stats to file"""
-        manager = UserStatsManager()
         manager.stats["12345"] = {
             "first_seen": "2023-01-01T00:00:00",
             "last_active": "2023-01-01T01:00:00",
@@ -162,11 +137,11 @@ class TestUserStatsManager:
             "listings_received": 10,
         }
 
-        with patch("builtins.open", create=True) as mock_open:
+        with patch("user_stats.open", create=True) as mock_file:
             with patch("json.dump") as mock_json_dump:
                 manager.save_stats()
 
-                mock_open.assert_called_once_with("user_stats.json", "w")
+                mock_file.assert_called_once_with("user_stats.json", "w")
                 mock_json_dump.assert_called_once()
 
                 # Verify the JSON dump was called with correct parameters
@@ -194,16 +169,16 @@ class TestUserStatsManager:
         assert manager.stats["12345"]["total_searches"] == 5
         assert manager.stats["12345"]["listings_received"] == 10
 
-    def test_stats_persistence_integration(self, temp_stats_file):
+    def test_stats_persistence_integration(
+        self, manager, monkeypatch, temp_stats_file
+    ):
         """Test full save/load cycle"""
-        # Create a manager and add some test data
-        manager = UserStatsManager()
-        manager.stats.clear()  # Clear any existing data
+        # Add some test data
 
         # Override save/load to use temp file
         def save_to_temp():
             with open(temp_stats_file, "w") as f:
-                json.dump(dict(manager.stats), f, indent=2, default=str)
+                json.dump(dict(manager.stats), f, separators=(",", ":"))
 
         def load_from_temp():
             try:
@@ -214,8 +189,8 @@ class TestUserStatsManager:
             except (FileNotFoundError, json.JSONDecodeError):
                 pass
 
-        manager.save_stats = save_to_temp
-        manager.load_stats = load_from_temp
+        monkeypatch.setattr(manager, "save_stats", save_to_temp)
+        monkeypatch.setattr(manager, "load_stats", load_from_temp)
 
         # Add some data
         manager.record_user_activity("12345", "search_start")
@@ -226,16 +201,7 @@ class TestUserStatsManager:
 
         # Create new manager without calling the constructor's load_stats
         new_manager = UserStatsManager.__new__(UserStatsManager)
-        new_manager.stats = defaultdict(
-            lambda: {
-                "first_seen": None,
-                "last_active": None,
-                "total_searches": 0,
-                "listings_received": 0,
-                "monitoring_sessions": 0,
-                "total_monitoring_time": 0,
-            }
-        )
+        new_manager.stats = {}
         new_manager.load_stats = load_from_temp
         new_manager.load_stats()
 
@@ -259,18 +225,17 @@ class TestStatsIntegration:
         stats_manager.record_user_activity("12345", "bot_access")
         mock_record.assert_called_once_with("12345", "bot_access")
 
-    def test_stats_manager_thread_safety(self):
+    def test_stats_manager_thread_safety(self, manager):
         """Test that stats manager is thread-safe for concurrent access"""
         import threading
-        import time
 
-        manager = UserStatsManager()
-        manager.stats.clear()
+        # Release every thread at once so their updates interleave
+        barrier = threading.Barrier(5)
 
         def record_activity(user_id, activity_count):
+            barrier.wait()
             for i in range(activity_count):
                 manager.record_user_activity(f"user_{user_id}", "search_start")
-                time.sleep(0.001)  # Small delay to encourage race conditions
 
         # Create multiple threads
         threads = []
@@ -284,45 +249,33 @@ class TestStatsIntegration:
             thread.join()
 
         # Verify all activities were recorded
-        total_searches = sum(
-            stats["total_searches"] for stats in manager.stats.values()
-        )
+        total_searches = sum(map(itemgetter("total_searches"), manager.stats.values()))
         assert total_searches == 50  # 5 users * 10 searches each
 
 
 class TestStatsManagerEdgeCases:
     """Test edge cases and error handling in stats manager"""
 
-    def test_invalid_activity_type(self):
-        """Test handling of invalid activity types"""
-        manager = UserStatsManager()
-        manager.stats.clear()
-
-        # Should not crash on unknown activity type
-        manager.record_user_activity("12345", "unknown_activity")
-
-        # User should still be recorded
-        assert "12345" in manager.stats
-        user_stats = manager.stats["12345"]
+    @pytest.mark.parametrize(
+        "user_id, activity, expected_key",
+        [
+            pytest.param("12345", "unknown_activity", "12345", id="unknown-activity"),
+            pytest.param("", "search_start", "", id="empty-user-id"),
+            pytest.param(None, "search_start", "None", id="none-user-id"),
+        ],
+    )
+    def test_record_handles_unusual_input(
+        self, manager, user_id, activity, expected_key
+    ):
+        """Test unknown activities and odd user IDs are still recorded"""
+        manager.record_user_activity(user_id, activity)
+
+        # User IDs are stored as strings, whatever the activity
+        assert expected_key in manager.stats
+        user_stats = manager.stats[expected_key]
         assert user_stats["first_seen"] is not None
         assert user_stats["last_active"] is not None
 
-    def test_empty_user_id(self):
-        """Test handling of empty user ID"""
-        manager = UserStatsManager()
-
-        # Should handle empty user ID gracefully
-        manager.record_user_activity("", "search_start")
-        assert "" in manager.stats
-
-    def test_none_user_id(self):
-        """Test handling of None user ID"""
-        manager = UserStatsManager()
-
-        # Should convert None to string
-        manager.record_user_activity(None, "search_start")
-        assert "None" in manager.stats
-
     @patch("user_stats.json.load")
     @patch("user_stats.open")
     def test_load_stats_corrupted_file(self, mock_open, mock_json_load):
@@ -342,11 +295,9 @@ class TestStatsManagerEdgeCases:
         manager = UserStatsManager()
         assert isinstance(manager.stats, dict)
 
-    def test_save_stats_permission_error(self):
+    def test_save_stats_permission_error(self, manager):
         """Test handling of permission error when saving stats"""
-        manager = UserStatsManager()
-
-        with patch("builtins.open", side_effect=PermissionError("Access denied")):
+        with patch("user_stats.open", side_effect=PermissionError("Access denied")):
             with patch("user_stats.logger") as mock_logger:
                 # Should not crash when save fails
                 try:
@@ -361,11 +312,8 @@ class TestStatsManagerEdgeCases:
                         f"save_stats should handle PermissionError gracefully, but raised: {e}"
                     )
 
-    def test_datetime_serialization(self):
+    def test_datetime_serialization(self, manager):
         """Test that datetime objects are properly serialized"""
-        manager = UserStatsManager()
-        manager.stats.clear()
-
         # Record activity (creates datetime strings)
         manager.record_user_activity("12345", "search_start")
 